@@ -0,0 +1,72 @@
+# circuit_breaker.py
+"""Circuit breaker for calls to the weather API."""
+
+import time
+from typing import Callable
+
+
+class CircuitBreaker:
+    """
+    Stops calling an unhealthy upstream until it has had time to recover.
+
+    closed:    requests flow normally; consecutive failures are counted
+    open:      requests are rejected immediately until reset_timeout passes
+    half_open: a limited number of trial requests are let through; one
+               success closes the circuit, one failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+
+        self._state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_calls = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once due."""
+        if (
+            self._state == self.OPEN
+            and self.clock() - self.opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self.trial_calls = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent upstream now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self.trial_calls < self.half_open_max_calls:
+            self.trial_calls += 1
+            return True
+        return False
+
+    def record_success(self):
+        """Record a healthy response and close the circuit."""
+        self._state = self.CLOSED
+        self.failures = 0
+        self.trial_calls = 0
+
+    def record_failure(self):
+        """Record a failure or timeout, opening the circuit if needed."""
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self.opened_at = self.clock()
+            self.trial_calls = 0
@@ -2,6 +2,7 @@
 """Configuration management for the Weather App."""
 
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -16,6 +17,10 @@ class Config:
         "OPENWEATHER_BASE_URL", 
         "https://api.openweathermap.org/data/2.5/weather"
     )
+    FORECAST_URL = os.getenv(
+        "OPENWEATHER_FORECAST_URL",
+        "https://api.openweathermap.org/data/2.5/forecast"
+    )
     
     # App Configuration
     APP_TITLE = "Weather App"
@@ -23,8 +28,51 @@ class Config:
     APP_HEIGHT = 600
     
     # API Settings
-    UNITS = "metric"  # metric, imperial, or standard
+    UNITS = "metric"  # canonical units fetched and cached; never changed
+    DISPLAY_UNITS = os.getenv("WEATHER_DISPLAY_UNITS", "metric")  # metric, imperial, or standard
     TIMEOUT = 10  # seconds
+    STALE_DEADLINE = 2  # seconds to wait before serving last-known data
+    CACHE_TTL = 600  # seconds; OWM updates observations every ~10 minutes
+    CACHE_MAX_ENTRIES = 2000
+    MAX_CONNECTIONS = 20
+    RATE_LIMIT_PER_MINUTE = 60  # free tier quota
+
+    # Hedged Request Settings
+    HEDGING_ENABLED = os.getenv("WEATHER_HEDGING", "false").lower() == "true"
+    HEDGE_PERCENTILE = 0.95  # hedge once a request is slower than this
+    HEDGE_BUDGET_RATIO = 0.1  # at most 10% extra requests
+    HEDGE_MIN_DELAY = 0.05  # seconds
+
+    # Circuit Breaker Settings
+    BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before opening
+    BREAKER_RESET_TIMEOUT = 30  # seconds before a trial request
+    BREAKER_HALF_OPEN_CALLS = 1
+
+    # Web Server Settings
+    WEB_PORT = int(os.getenv("WEATHER_WEB_PORT", "8550"))
+
+    # Storage Settings
+    STORE_DIR = Path(os.getenv("WEATHER_STORE_DIR", "weather_store"))
+
+    # Prefetch Settings
+    PREFETCH_BUDGET_PER_HOUR = 30  # upstream calls prefetching may spend
+    PREFETCH_IDLE_SECONDS = 5
+    PREFETCH_TOP_N = 3
+
+    # Dashboard Settings
+    WATCH_LIST_FILE = Path(os.getenv("WEATHER_WATCH_LIST", "watch_list.json"))
+    DASHBOARD_VISIBLE_ROWS = 10
+    DASHBOARD_CONCURRENCY = 5
+
+    # Event Loop Watchdog Settings (opt-in)
+    WATCHDOG_ENABLED = os.getenv("WEATHER_WATCHDOG", "false").lower() == "true"
+    WATCHDOG_THRESHOLD_MS = int(os.getenv("WEATHER_WATCHDOG_THRESHOLD_MS", "100"))
+    WATCHDOG_EXPORT_FILE = Path(os.getenv("WEATHER_WATCHDOG_FILE", "watchdog_events.jsonl"))
+    WATCHDOG_SUMMARY_SECONDS = int(os.getenv("WEATHER_WATCHDOG_SUMMARY_SECONDS", "60"))
+
+    # Chart Settings
+    CHART_WIDTH = 640  # pixels; series are downsampled to this many points
+    CHART_HISTORY_DAYS = 7
     
     @classmethod
     def validate(cls):
@@ -34,6 +82,11 @@ class Config:
                 "OPENWEATHER_API_KEY not found. "
                 "Please create a .env file with your API key."
             )
+        if cls.DISPLAY_UNITS not in ("metric", "imperial", "standard"):
+            raise ValueError(
+                f"Unknown WEATHER_DISPLAY_UNITS '{cls.DISPLAY_UNITS}'. "
+                "Use metric, imperial or standard."
+            )
         return True
 
 # Validate configuration on import
@@ -0,0 +1,327 @@
+# dashboard.py
+"""Virtualized multi-city dashboard."""
+
+import asyncio
+from typing import Callable, Dict, Optional
+
+import flet as ft
+
+import units
+from watch_list import CityEntry, WatchList
+from weather_service import WeatherService, WeatherServiceError
+from weather_store import WeatherStore
+
+
+class CityRow:
+    """A reusable row control that can display any CityEntry."""
+
+    HEIGHT = 48
+
+    def __init__(self, on_remove: Callable[[str], None]):
+        self.city: Optional[str] = None
+        self.icon = ft.Image(width=36, height=36, visible=False)
+        self.name = ft.Text(
+            "", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900,
+            expand=True,
+        )
+        self.description = ft.Text("", size=14, color=ft.Colors.GREY_700)
+        self.temp = ft.Text(
+            "", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900,
+            width=80, text_align=ft.TextAlign.RIGHT,
+        )
+        self.remove_button = ft.IconButton(
+            icon=ft.Icons.CLOSE,
+            icon_size=18,
+            tooltip="Remove",
+            on_click=lambda e: on_remove(self.city),
+        )
+        self.control = ft.Container(
+            content=ft.Row(
+                [
+                    self.icon, self.name, self.description, self.temp,
+                    self.remove_button,
+                ],
+                spacing=10,
+            ),
+            height=self.HEIGHT,
+            bgcolor=ft.Colors.WHITE,
+            border_radius=8,
+            padding=ft.padding.symmetric(horizontal=12),
+            visible=False,
+        )
+
+    def bind(self, entry: CityEntry, unit_system: str):
+        """Show entry in this row."""
+        self.city = entry.name
+        self.name.value = entry.name
+        if entry.temp is not None:
+            temp = units.convert_one("temperature", entry.temp, unit_system)
+            self.temp.value = f"{temp:.1f}{units.label('temperature', unit_system)}"
+        else:
+            self.temp.value = "—"
+        self.description.value = entry.error or entry.description or "Loading..."
+        self.description.color = (
+            ft.Colors.RED_700 if entry.error else ft.Colors.GREY_700
+        )
+        if entry.icon:
+            self.icon.src = f"https://openweathermap.org/img/wn/{entry.icon}.png"
+        self.icon.visible = bool(entry.icon)
+        self.control.visible = True
+
+    def clear(self):
+        """Hide this row."""
+        self.city = None
+        self.control.visible = False
+
+
+class DashboardView:
+    """
+    Watch list of many cities rendered through a fixed pool of rows.
+
+    Only as many row controls exist as fit in the viewport. Scrolling,
+    sorting and filtering re-bind those rows to different entries of the
+    WatchList, and new data for a city only updates its row if it is on
+    screen. Fresh snapshots are also appended to the weather store.
+    """
+
+    SORT_OPTIONS = {
+        "Name": ("name", False),
+        "Warmest": ("temp", True),
+        "Coldest": ("temp", False),
+        "Condition": ("condition", False),
+    }
+
+    def __init__(
+        self,
+        weather_service: WeatherService,
+        watch_list_store,
+        visible_rows: int,
+        concurrency: int,
+        unit_system: str = "metric",
+        weather_store: Optional[WeatherStore] = None,
+    ):
+        self.weather_service = weather_service
+        self.weather_store = weather_store
+        self.watch_list_store = watch_list_store
+        self.watch_list = WatchList.load(watch_list_store)
+        self.concurrency = concurrency
+        self.unit_system = unit_system
+        self.offset = 0
+
+        self.rows = [CityRow(self.on_remove) for _ in range(visible_rows)]
+        # Which row currently shows which city
+        self.slots: Dict[str, CityRow] = {}
+
+        self.list_view = ft.ListView(
+            controls=[row.control for row in self.rows],
+            item_extent=CityRow.HEIGHT,
+            spacing=0,
+            height=CityRow.HEIGHT * visible_rows,
+        )
+        self.scroller = ft.GestureDetector(
+            content=self.list_view,
+            on_scroll=self.on_scroll,
+        )
+        self.scrubber = ft.Slider(min=0, max=1, value=0, on_change=self.on_scrub)
+        self.count_text = ft.Text("", size=12, color=ft.Colors.GREY_700)
+
+        self.add_input = ft.TextField(
+            label="Add city",
+            border_radius=12,
+            height=40,
+            expand=True,
+            on_submit=self.on_add,
+        )
+        self.filter_input = ft.TextField(
+            label="Filter by name or condition",
+            border_radius=12,
+            height=40,
+            expand=True,
+            on_change=self.on_filter,
+        )
+        self.band_dropdown = ft.Dropdown(
+            label="Temperature",
+            width=140,
+            value="all",
+            options=[
+                ft.dropdown.Option("all", "All"),
+                ft.dropdown.Option("hot", "Hot"),
+                ft.dropdown.Option("mild", "Mild"),
+                ft.dropdown.Option("cold", "Cold"),
+            ],
+            on_change=self.on_filter,
+        )
+        self.sort_dropdown = ft.Dropdown(
+            label="Sort by",
+            width=140,
+            value="Name",
+            options=[ft.dropdown.Option(name) for name in self.SORT_OPTIONS],
+            on_change=self.on_sort,
+        )
+
+        self.control = ft.Container(
+            content=ft.Column(
+                [
+                    ft.Row(
+                        [
+                            ft.Text(
+                                "Watch List",
+                                size=20,
+                                weight=ft.FontWeight.BOLD,
+                                color=ft.Colors.BLUE_900,
+                            ),
+                            ft.IconButton(
+                                icon=ft.Icons.REFRESH,
+                                tooltip="Refresh all",
+                                on_click=self.on_refresh,
+                            ),
+                        ],
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                    ),
+                    ft.Row([self.add_input], spacing=10),
+                    ft.Row(
+                        [self.filter_input, self.band_dropdown, self.sort_dropdown],
+                        spacing=10,
+                    ),
+                    self.scroller,
+                    ft.Row([self.count_text, self.scrubber], spacing=10),
+                ],
+                spacing=10,
+            ),
+            bgcolor=ft.Colors.BLUE_50,
+            border_radius=12,
+            padding=20,
+            width=800,
+            visible=False,
+        )
+        self.bind()
+
+    def bind(self):
+        """Point the row pool at the entries in the current window."""
+        total = len(self.watch_list.visible)
+        max_offset = max(total - len(self.rows), 0)
+        self.offset = min(max(self.offset, 0), max_offset)
+
+        self.slots = {}
+        window = self.watch_list.window(self.offset, len(self.rows))
+        for i, row in enumerate(self.rows):
+            if i < len(window):
+                row.bind(window[i], self.unit_system)
+                self.slots[window[i].key] = row
+            else:
+                row.clear()
+
+        self.scrubber.max = max(max_offset, 1)
+        self.scrubber.value = self.offset
+        self.scrubber.disabled = max_offset == 0
+        last = min(self.offset + len(self.rows), total)
+        self.count_text.value = (
+            f"{self.offset + 1 if total else 0}–{last} of {total}"
+        )
+
+    def refresh_view(self):
+        """Re-bind rows and push only the dashboard to the client."""
+        self.bind()
+        if self.control.page:
+            self.control.update()
+
+    def set_unit_system(self, unit_system: str):
+        """Redisplay temperatures in another unit system."""
+        self.unit_system = unit_system
+        self.refresh_view()
+
+    def scroll_to(self, offset: int):
+        """Show the window starting at offset."""
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh_view()
+
+    def on_scroll(self, e: ft.ScrollEvent):
+        # Horizontal-only scrolls carry no vertical delta
+        if not e.scroll_delta_y:
+            return
+        step = 1 if e.scroll_delta_y > 0 else -1
+        self.scroll_to(self.offset + step * max(len(self.rows) // 4, 1))
+
+    def on_scrub(self, e):
+        self.scroll_to(int(e.control.value))
+
+    def on_filter(self, e):
+        band = self.band_dropdown.value
+        self.watch_list.set_filter(
+            self.filter_input.value or "",
+            None if band == "all" else band,
+        )
+        self.offset = 0
+        self.refresh_view()
+
+    def on_sort(self, e):
+        key, reverse = self.SORT_OPTIONS[self.sort_dropdown.value]
+        self.watch_list.set_sort(key, reverse)
+        self.offset = 0
+        self.refresh_view()
+
+    async def on_add(self, e):
+        entry = self.watch_list.add(self.add_input.value or "")
+        self.add_input.value = ""
+        if entry is None:
+            self.refresh_view()
+            return
+        self.watch_list.save(self.watch_list_store)
+        self.refresh_view()
+        await self.fetch_city(entry.name)
+
+    def on_remove(self, city: Optional[str]):
+        if not city:
+            return
+        self.watch_list.remove(city)
+        self.watch_list.save(self.watch_list_store)
+        self.refresh_view()
+
+    async def on_refresh(self, e):
+        await self.refresh_all()
+
+    def on_city_data(self, entry: Optional[CityEntry]):
+        """Update a single row if its city is currently on screen."""
+        if entry is None:
+            return
+        row = self.slots.get(entry.key)
+        if row:
+            row.bind(entry, self.unit_system)
+            if row.control.page:
+                row.control.update()
+
+    async def fetch_city(self, city: str):
+        """Fetch one city and update its row."""
+        try:
+            data = await self.weather_service.get_weather(city)
+            self.on_city_data(self.watch_list.update(city, data))
+            self.record_observation(data)
+        except WeatherServiceError as e:
+            self.on_city_data(self.watch_list.set_error(city, str(e)))
+
+    def record_observation(self, data: Dict):
+        """Append a freshly fetched snapshot to the weather store."""
+        if self.weather_store is None or "_stale" in data:
+            return
+        try:
+            self.weather_store.append(data)
+        except (OSError, ValueError):
+            # History is best-effort; never block the dashboard
+            pass
+
+    async def refresh_all(self):
+        """Fetch every watched city, a few at a time."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(city: str):
+            async with semaphore:
+                await self.fetch_city(city)
+
+        # Rows on screen first, then everything else
+        on_screen = self.watch_list.window(self.offset, len(self.rows))
+        rest = [e for e in self.watch_list.entries if e.key not in self.slots]
+        await asyncio.gather(*[fetch(entry.name) for entry in on_screen + rest])
+        # Sort and filter may depend on the new temperatures
+        self.watch_list.apply()
+        self.refresh_view()
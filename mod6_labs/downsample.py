@@ -0,0 +1,63 @@
+# downsample.py
+"""Series downsampling helpers for charts."""
+
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    LTTB keeps the first and last points and, for every bucket in
+    between, picks the point forming the largest triangle with its
+    neighbours, so peaks and dips survive the reduction.
+
+    Args:
+        points: (x, y) pairs sorted by x
+        threshold: Maximum number of points to return (at least 3)
+
+    Returns:
+        The downsampled series (the input unchanged if already small)
+    """
+    if threshold < 3:
+        raise ValueError("threshold must be at least 3")
+
+    count = len(points)
+    if threshold >= count:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    selected = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket acts as the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, count)
+        next_bucket = points[next_start:next_end]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        anchor_x, anchor_y = points[selected]
+
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs(
+                (anchor_x - avg_x) * (y - anchor_y)
+                - (anchor_x - x) * (avg_y - anchor_y)
+            )
+            if area > best_area:
+                best_area = area
+                best = j
+
+        sampled.append(points[best])
+        selected = best
+
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,222 @@
+# forecast_chart.py
+"""Hourly temperature and precipitation chart."""
+
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import flet as ft
+
+from downsample import Point, lttb
+from weather_store import WeatherStore
+
+
+def forecast_series(data: Dict, now: Optional[float] = None):
+    """
+    Extract temperature and precipitation series from a forecast payload.
+
+    X values are hours relative to now, so history is negative and
+    forecast is positive.
+
+    Returns:
+        Tuple of (temperature points, precipitation points)
+    """
+    now = time.time() if now is None else now
+    temps, precip = [], []
+    for item in data.get("list", []):
+        x = (item["dt"] - now) / 3600
+        temps.append((x, item["main"]["temp"]))
+        rain = item.get("rain", {}).get("3h", 0)
+        snow = item.get("snow", {}).get("3h", 0)
+        precip.append((x, rain + snow))
+    return temps, precip
+
+
+def history_series(
+    store: WeatherStore,
+    key: str,
+    days: int,
+    now: Optional[float] = None,
+) -> List[Point]:
+    """Return hourly mean temperatures recorded over the last few days."""
+    now = time.time() if now is None else now
+    buckets = store.aggregate(key, 3600, start=int(now - days * 86400))
+    return [((b.bucket_start - now) / 3600, b.temp_mean) for b in buckets]
+
+
+class ForecastChart:
+    """
+    Line charts for temperature and precipitation with pan and zoom.
+
+    The full series stay in Python; only the visible window, downsampled
+    to the chart's pixel width, is ever sent to the Flet controls.
+    """
+
+    def __init__(self, width: int, height: int = 180):
+        self.width = width
+        self.temps: List[Point] = []
+        self.precip: List[Point] = []
+        self.temp_xs: List[float] = []
+        self.precip_xs: List[float] = []
+        self.view_start = 0.0
+        self.view_end = 0.0
+
+        self.temp_data = ft.LineChartData(
+            data_points=[],
+            stroke_width=3,
+            color=ft.Colors.ORANGE_700,
+            curved=True,
+        )
+        self.precip_data = ft.LineChartData(
+            data_points=[],
+            stroke_width=2,
+            color=ft.Colors.BLUE_700,
+            below_line_bgcolor=ft.Colors.with_opacity(0.3, ft.Colors.BLUE_400),
+        )
+
+        self.temp_chart = self.build_chart(self.temp_data, "°C", height)
+        self.precip_chart = self.build_chart(self.precip_data, "mm", height // 2)
+
+        self.control = ft.Column(
+            [
+                ft.Row(
+                    [
+                        ft.Text(
+                            "Hourly Temperature & Precipitation",
+                            size=20,
+                            weight=ft.FontWeight.BOLD,
+                            color=ft.Colors.BLUE_900,
+                        ),
+                        ft.Row(
+                            [
+                                ft.IconButton(
+                                    icon=ft.Icons.CHEVRON_LEFT,
+                                    tooltip="Earlier",
+                                    on_click=lambda e: self.pan(-0.5),
+                                ),
+                                ft.IconButton(
+                                    icon=ft.Icons.ZOOM_OUT,
+                                    tooltip="Zoom out",
+                                    on_click=lambda e: self.zoom(2),
+                                ),
+                                ft.IconButton(
+                                    icon=ft.Icons.ZOOM_IN,
+                                    tooltip="Zoom in",
+                                    on_click=lambda e: self.zoom(0.5),
+                                ),
+                                ft.IconButton(
+                                    icon=ft.Icons.CHEVRON_RIGHT,
+                                    tooltip="Later",
+                                    on_click=lambda e: self.pan(0.5),
+                                ),
+                            ],
+                            spacing=0,
+                        ),
+                    ],
+                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                ),
+                self.temp_chart,
+                self.precip_chart,
+            ],
+            spacing=10,
+        )
+
+    def build_chart(self, series: ft.LineChartData, unit: str, height: int):
+        """Create a line chart for a single series."""
+        return ft.LineChart(
+            data_series=[series],
+            width=self.width,
+            height=height,
+            left_axis=ft.ChartAxis(labels_size=40, title=ft.Text(unit, size=12)),
+            bottom_axis=ft.ChartAxis(
+                labels_size=30,
+                title=ft.Text("Hours from now", size=12),
+            ),
+            horizontal_grid_lines=ft.ChartGridLines(
+                color=ft.Colors.with_opacity(0.2, ft.Colors.GREY_600),
+                width=1,
+            ),
+            tooltip_bgcolor=ft.Colors.with_opacity(0.8, ft.Colors.WHITE),
+            interactive=True,
+        )
+
+    def set_series(
+        self,
+        temps: Sequence[Point],
+        precip: Sequence[Point],
+        reset_view: bool = True,
+    ):
+        """Replace the full series, by default showing all of it."""
+        self.temps = sorted(temps)
+        self.precip = sorted(precip)
+        self.temp_xs = [p[0] for p in self.temps]
+        self.precip_xs = [p[0] for p in self.precip]
+        if reset_view:
+            self.view_start, self.view_end = self.bounds() or (0.0, 0.0)
+        self.render()
+
+    def set_temp_unit(self, unit: str):
+        """Change the temperature axis label, e.g. after a unit switch."""
+        self.temp_chart.left_axis.title.value = unit
+
+    def visible(self, points: List[Point], xs: List[float]) -> List[Point]:
+        """Return the points inside the current view, downsampled."""
+        window = points[
+            bisect_left(xs, self.view_start):bisect_right(xs, self.view_end)
+        ]
+        # One point per pixel is the most a chart can show anyway
+        return lttb(window, max(self.width, 3))
+
+    def render(self):
+        """Update the chart series for the current view."""
+        for chart, data, points, xs in (
+            (self.temp_chart, self.temp_data, self.temps, self.temp_xs),
+            (self.precip_chart, self.precip_data, self.precip, self.precip_xs),
+        ):
+            data.data_points = [
+                ft.LineChartDataPoint(round(x, 2), round(y, 2))
+                for x, y in self.visible(points, xs)
+            ]
+            chart.min_x = self.view_start
+            chart.max_x = self.view_end
+
+    def refresh(self):
+        """Re-render and push only the chart controls to the client."""
+        self.render()
+        if self.temp_chart.page:
+            self.temp_chart.update()
+            self.precip_chart.update()
+
+    def bounds(self) -> Optional[Tuple[float, float]]:
+        """Return the (min, max) x of all loaded data, or None if empty."""
+        xs = self.temp_xs + self.precip_xs
+        if not xs:
+            return None
+        return min(xs), max(xs)
+
+    def set_view(self, start: float, end: float):
+        """Show [start, end], kept inside the data and re-rendered."""
+        bounds = self.bounds()
+        if bounds is not None:
+            low, high = bounds
+            span = end - start
+            if span >= high - low:
+                start, end = low, high
+            elif start < low:
+                start, end = low, low + span
+            elif end > high:
+                start, end = high - span, high
+        self.view_start = start
+        self.view_end = end
+        self.refresh()
+
+    def pan(self, fraction: float):
+        """Shift the view by a fraction of its width."""
+        shift = (self.view_end - self.view_start) * fraction
+        self.set_view(self.view_start + shift, self.view_end + shift)
+
+    def zoom(self, factor: float):
+        """Scale the view around its centre (factor < 1 zooms in)."""
+        centre = (self.view_start + self.view_end) / 2
+        half = max((self.view_end - self.view_start) * factor / 2, 1.5)
+        self.set_view(centre - half, centre + half)
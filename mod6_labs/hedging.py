@@ -0,0 +1,110 @@
+# hedging.py
+"""Hedged requests to cut tail latency."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    Decides when a backup request should be sent.
+
+    The hedge delay follows an observed latency percentile (p95 by
+    default), and a token budget earning budget_ratio tokens per request
+    keeps hedges to at most that fraction of extra traffic.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget_ratio: float = 0.1,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        max_tokens: float = 10.0,
+    ):
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_tokens = max_tokens
+        self.samples = deque(maxlen=window)
+        self.tokens = 0.0
+        self.requests = 0
+        self.hedges = 0
+
+    def record(self, seconds: float):
+        """Record the latency of a successful request."""
+        self.samples.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """Return how long to wait before hedging, or None if unknown yet."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(int(len(ordered) * self.percentile), len(ordered) - 1)
+        return max(ordered[index], self.min_delay)
+
+    def on_request(self):
+        """Earn hedge budget for a new primary request."""
+        self.requests += 1
+        # Rounded so e.g. ten requests at 0.1 add up to exactly one hedge
+        self.tokens = min(
+            round(self.tokens + self.budget_ratio, 9), self.max_tokens
+        )
+
+    def try_hedge(self, allow_extra: Callable[[], bool] = lambda: True) -> bool:
+        """Spend budget on a hedge if there is enough and allow_extra agrees."""
+        if self.tokens < 1 or not allow_extra():
+            return False
+        self.tokens -= 1
+        self.hedges += 1
+        return True
+
+
+async def hedged(
+    factory: Callable[[], Awaitable[T]],
+    policy: HedgePolicy,
+    allow_extra: Callable[[], bool] = lambda: True,
+) -> T:
+    """
+    Run factory(), starting a second copy if the first is slow.
+
+    Whichever copy succeeds first wins and the other is cancelled. If
+    one copy fails, the other is still awaited. Only use this for
+    idempotent requests.
+
+    Args:
+        factory: Creates a new awaitable for the request each call
+        policy: Provides the hedge delay and budget
+        allow_extra: Final check before hedging, e.g. a quota limiter
+    """
+    policy.on_request()
+    start = time.monotonic()
+    tasks = {asyncio.ensure_future(factory())}
+
+    try:
+        delay = policy.delay()
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and policy.try_hedge(allow_extra):
+                tasks.add(asyncio.ensure_future(factory()))
+
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    policy.record(time.monotonic() - start)
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,87 @@
+# load_test.py
+"""Simulate many concurrent web sessions sharing one WeatherService."""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+# The mock upstream does not need a real key
+os.environ.setdefault("OPENWEATHER_API_KEY", "load-test")
+
+import httpx
+from weather_service import WeatherService
+
+CITIES = [
+    "London", "Tokyo", "New York", "Manila", "Paris", "Berlin", "Sydney",
+    "Cairo", "Lima", "Toronto", "Seoul", "Nairobi", "Madrid", "Dubai",
+]
+
+
+def make_transport(latency: float) -> httpx.MockTransport:
+    """Create a fake OpenWeatherMap that answers after a fixed delay."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        city = request.url.params.get("q", "Unknown")
+        return httpx.Response(200, json={
+            "name": city,
+            "dt": int(time.time()),
+            "main": {"temp": 20.0, "humidity": 60, "pressure": 1012},
+            "wind": {"speed": 3.0},
+            "weather": [{"id": 800, "description": "clear sky", "icon": "01d"}],
+            "list": [],
+        })
+
+    return httpx.MockTransport(handler)
+
+
+async def session(service: WeatherService, searches: int, latencies: list):
+    """One simulated user searching a few cities with think time."""
+    for _ in range(searches):
+        city = random.choice(CITIES)
+        start = time.perf_counter()
+        await service.get_weather(city)
+        await service.get_forecast(city)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(random.uniform(0, 0.05))
+
+
+async def run_load_test(sessions: int, searches: int, latency: float):
+    """Run the simulation and print a summary."""
+    service = WeatherService(transport=make_transport(latency))
+    # Quota is not what is being measured here
+    service.rate_limiter.capacity = service.rate_limiter.tokens = 10 ** 9
+    latencies = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        session(service, searches, latencies) for _ in range(sessions)
+    ])
+    elapsed = time.perf_counter() - start
+    await service.close()
+
+    requests = sessions * searches * 2
+    print(f"Sessions:        {sessions}")
+    print(f"Requests:        {requests}")
+    print(f"Upstream calls:  {service.upstream_calls}")
+    print(f"Elapsed:         {elapsed:.2f}s")
+    print(f"Median latency:  {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"p95 latency:     {sorted(latencies)[int(len(latencies) * 0.95)] * 1000:.1f} ms")
+    return service.upstream_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--sessions", type=int, default=200)
+    parser.add_argument("-s", "--searches", type=int, default=5)
+    parser.add_argument("-l", "--latency", type=float, default=0.2,
+                        help="simulated upstream latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(run_load_test(args.sessions, args.searches, args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# loop_watchdog.py
+"""Event loop lag watchdog and blocking-call detector."""
+
+import asyncio
+import inspect
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the lag histogram buckets, in milliseconds
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf"))
+
+APP_DIR = Path(__file__).resolve().parent
+
+
+def _bucket_label(bound: float) -> str:
+    return "inf" if bound == float("inf") else f"<={bound:g}ms"
+
+
+def handler_codes(classes: Iterable[type]) -> Set[CodeType]:
+    """Collect the code objects of all methods defined on classes."""
+    return {
+        value.__code__
+        for cls in classes
+        for value in vars(cls).values()
+        if inspect.isfunction(value)
+    }
+
+
+def blocking_handler(frame: FrameType, codes: Set[CodeType]) -> Optional[str]:
+    """
+    Return the outermost handler method on a frame's stack, e.g. 'get_weather'.
+
+    Args:
+        frame: Innermost frame of the blocked thread
+        codes: Code objects of the handler methods (see handler_codes)
+    """
+    name = None
+    while frame is not None:
+        if frame.f_code in codes:
+            name = frame.f_code.co_name
+        frame = frame.f_back
+    return name
+
+
+def blocking_site(stack: traceback.StackSummary) -> str:
+    """
+    Return the innermost app function in a stack, e.g. 'save'.
+
+    Library and stdlib frames are skipped so the name points at our code.
+    """
+    for frame in reversed(stack):
+        path = Path(frame.filename).resolve()
+        if path.parent == APP_DIR and path.name != "loop_watchdog.py":
+            return frame.name
+    return stack[-1].name if stack else "unknown"
+
+
+class LoopWatchdog:
+    """
+    Measures event loop lag and captures what is blocking it.
+
+    A heartbeat task on the loop sleeps for `interval` and records how
+    late it wakes up. A background thread watches the heartbeat; when it
+    is more than `threshold` seconds overdue, the thread grabs the loop
+    thread's current stack, which is the callback that is blocking.
+    Each event names the outermost method of handler_classes on that
+    stack as its handler (e.g. WeatherApp.get_weather) and the innermost
+    app function as its site (e.g. FileStore.save).
+
+    Every `summary_interval` seconds, and again on stop, the lag
+    histogram and per-handler stats are logged and exported. Only the
+    last `recent_events` blocking events are kept in memory; the export
+    file holds all of them.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float = 0.05,
+        export_file: Optional[Path] = None,
+        summary_interval: float = 60.0,
+        handler_classes: Iterable[type] = (),
+        recent_events: int = 100,
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.export_file = export_file
+        self.summary_interval = summary_interval
+        self._handler_codes = handler_codes(handler_classes)
+        self.histogram: Dict[str, int] = {_bucket_label(b): 0 for b in BUCKETS_MS}
+        self.handler_stats: Dict[str, Dict[str, float]] = {}
+        self.events = deque(maxlen=recent_events)
+        self.blocking_events = 0
+
+        self._last_beat = time.monotonic()
+        self._pending: Optional[Dict] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start watching the running event loop."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.ensure_future(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._monitor, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching and report a final summary."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        task, self._task = self._task, None
+        # At interpreter exit the loop may already be closed; the
+        # heartbeat then simply never runs again
+        if task is not None and not task.get_loop().is_closed():
+            task.cancel()
+        self.report_summary()
+
+    def report_summary(self):
+        """Log the current summary and append it to the export file."""
+        summary = self.summary()
+        logger.info("Event loop watchdog summary: %s", json.dumps(summary))
+        if self.export_file:
+            self._export({"type": "summary", "time": time.time(), **summary})
+
+    async def _heartbeat(self):
+        next_summary = time.monotonic() + self.summary_interval
+        while not self._stopped.is_set():
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._record_lag(max(now - expected, 0.0))
+            with self._lock:
+                self._last_beat = now
+                pending, self._pending = self._pending, None
+            if pending:
+                self._finish_event(pending, now)
+            if now >= next_summary:
+                self.report_summary()
+                next_summary = now + self.summary_interval
+
+    def _record_lag(self, lag: float):
+        lag_ms = lag * 1000
+        for bound in BUCKETS_MS:
+            if lag_ms <= bound:
+                self.histogram[_bucket_label(bound)] += 1
+                break
+
+    def _monitor(self):
+        """Thread loop: capture the loop's stack when the heartbeat stalls."""
+        while not self._stopped.wait(self.threshold / 2):
+            with self._lock:
+                overdue = time.monotonic() - self._last_beat - self.interval
+                if overdue < self.threshold or self._pending is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                stack = traceback.extract_stack(frame)
+                site = blocking_site(stack)
+                self._pending = {
+                    "started": self._last_beat + self.interval,
+                    "handler": blocking_handler(frame, self._handler_codes) or site,
+                    "site": site,
+                    "stack": traceback.format_list(stack),
+                }
+
+    def _finish_event(self, pending: Dict, now: float):
+        """Complete a blocking event once the loop is responsive again."""
+        duration_ms = (now - pending["started"]) * 1000
+        event = {
+            "type": "block",
+            "time": time.time(),
+            "handler": pending["handler"],
+            "site": pending["site"],
+            "duration_ms": round(duration_ms, 1),
+            "stack": pending["stack"],
+        }
+        self.events.append(event)
+        self.blocking_events += 1
+
+        stats = self.handler_stats.setdefault(
+            event["handler"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        stats["count"] += 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+        logger.warning(
+            "Event loop blocked for %.0f ms in %s (at %s)\n%s",
+            duration_ms, event["handler"], event["site"], "".join(event["stack"][-5:]),
+        )
+        if self.export_file:
+            self._export(event)
+
+    def _export(self, record: Dict):
+        try:
+            with open(self.export_file, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.error("Could not write watchdog record: %s", e)
+
+    def summary(self) -> Dict:
+        """Return the lag histogram and per-handler blocking stats."""
+        return {
+            "lag_histogram": dict(self.histogram),
+            "handlers": {
+                name: dict(stats) for name, stats in self.handler_stats.items()
+            },
+            "blocking_events": self.blocking_events,
+        }
@@ -1,21 +1,53 @@
 import flet as ft
 import httpx
-from weather_service import WeatherService
+from weather_service import ServiceUnavailableError, WeatherService
+from weather_store import WeatherStore, city_key
+from dashboard import DashboardView
+from prefetch import CallBudget, Prefetcher
+from loop_watchdog import LoopWatchdog
+from storage import ClientStorageStore, FileStore
+from forecast_chart import ForecastChart, forecast_series, history_series
+import units
 from config import Config
-import json
+import atexit
+import logging
+import sys
+import threading
 from pathlib import Path
+from typing import Optional
 
 
 class WeatherApp:
     """Main Weather Application class."""
     
-    def __init__(self, page: ft.Page):
+    def __init__(
+        self,
+        page: ft.Page,
+        weather_service: Optional[WeatherService] = None,
+        weather_store: Optional[WeatherStore] = None,
+        history_store=None,
+        watch_list_store=None,
+        prefetch_budget: Optional[CallBudget] = None,
+    ):
         self.page = page
-        self.history_file = Path("search_history.json")
+        self.history_store = history_store or FileStore(Path("search_history.json"))
+        self.watch_list_store = watch_list_store or FileStore(Config.WATCH_LIST_FILE)
         self.search_history = self.load_history()
-        self.weather_service = WeatherService()
+        self.weather_service = weather_service or WeatherService()
+        self.weather_store = weather_store or WeatherStore(Config.STORE_DIR)
+        self.unit_system = Config.DISPLAY_UNITS
+        self.current_weather = None
+        self.current_forecast = None
+        self.chart_series = ([], [])
+        self.prefetcher = Prefetcher(
+            self.weather_service,
+            prefetch_budget or CallBudget(Config.PREFETCH_BUDGET_PER_HOUR),
+            idle_delay=Config.PREFETCH_IDLE_SECONDS,
+            top_n=Config.PREFETCH_TOP_N,
+        )
         self.setup_page()
         self.build_ui()
+        self.page.run_task(self.schedule_prefetch)
 
     def setup_page(self):
         self.page.title = Config.APP_TITLE
@@ -40,11 +72,8 @@ class WeatherApp:
         self.page.window.center()
     
     def load_history(self):
-        """Load saved search history from file."""
-        if self.history_file.exists():
-            with open(self.history_file, "r") as f:
-                return json.load(f)
-        return []
+        """Load saved search history."""
+        return self.history_store.load([])
 
     def on_history_select(self, e):
         """Handle dropdown selection."""
@@ -54,6 +83,26 @@ class WeatherApp:
             self.page.update()
             self.page.run_task(self.get_weather)
 
+    async def schedule_prefetch(self):
+        """Warm likely cities once the user has been idle for a while."""
+        self.prefetcher.schedule_idle(self.search_history)
+
+    async def on_history_focus(self, e):
+        """Prefetch history entries as soon as the dropdown is opened."""
+        self.prefetcher.on_intent(self.prefetcher.rank(self.search_history))
+
+    async def on_city_input_change(self, e):
+        """Prefetch history entries matching what is being typed."""
+        text = (self.city_input.value or "").strip().lower()
+        if len(text) >= 2:
+            suggestions = [
+                city for city in self.search_history
+                if city.lower().startswith(text)
+            ]
+            if suggestions:
+                self.prefetcher.on_intent(self.prefetcher.rank(suggestions))
+        self.prefetcher.schedule_idle(self.search_history)
+
     def build_history_dropdown(self):
         """Build dropdown with event handler connected."""
         return ft.Dropdown(
@@ -65,13 +114,13 @@ class WeatherApp:
             bgcolor=ft.Colors.WHITE,
             options=[ft.dropdown.Option(city) for city in self.search_history],
             on_change=self.on_history_select, 
+            on_focus=self.on_history_focus,
             expand=True,
         )
 
     def save_history(self):
         """Save city to search history."""
-        with open(self.history_file, "w") as f:
-            json.dump(self.search_history, f)
+        self.history_store.save(self.search_history)
 
     def add_to_history(self, city: str):
         """Add city to search history."""
@@ -81,6 +130,14 @@ class WeatherApp:
             self.search_history = self.search_history[:5] 
             self.save_history()
     
+    def record_observation(self, data: dict):
+        """Append a fetched weather snapshot to the local store."""
+        try:
+            self.weather_store.append(data)
+        except (OSError, ValueError):
+            # History is best-effort; never block displaying the weather
+            pass
+
     def update_history_dropdown(self):
         """Update the search history dropdown options."""
         self.history_dropdown.options = [
@@ -114,10 +171,26 @@ class WeatherApp:
             icon_color=ft.Colors.BLUE_700,
         ) 
         
+        self.unit_button = ft.TextButton(
+            text=units.label("temperature", self.unit_system),
+            tooltip="Switch units",
+            on_click=self.toggle_units,
+        )
+
+        self.dashboard_button = ft.IconButton(
+            icon=ft.Icons.DASHBOARD_OUTLINED,
+            tooltip="Watch list",
+            on_click=self.toggle_dashboard,
+            icon_color=ft.Colors.BLUE_700,
+        )
+
         title_row = ft.Row(
             [
                 self.title,
-                self.theme_button,
+                ft.Row(
+                    [self.unit_button, self.dashboard_button, self.theme_button],
+                    spacing=0,
+                ),
             ],
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
         )
@@ -133,6 +206,7 @@ class WeatherApp:
             border_radius=12,
             height= 40,
             on_submit=self.on_search_async,
+            on_change=self.on_city_input_change,
         )
         
         # Search history dropdown
@@ -203,6 +277,18 @@ class WeatherApp:
             alignment=ft.alignment.center,
         )
 
+        # Hourly chart (hidden initially)
+        self.forecast_chart = ForecastChart(width=Config.CHART_WIDTH)
+        self.chart_container = ft.Container(
+            content=self.forecast_chart.control,
+            visible=False,
+            bgcolor=ft.Colors.BLUE_50,
+            border_radius=12,
+            padding=20,
+            width=900,
+            alignment=ft.alignment.center,
+        )
+
         
         # Error message
         self.error_message = ft.Text(
@@ -210,6 +296,24 @@ class WeatherApp:
             color=ft.Colors.RED_700,
             visible=False,
         )
+
+        # Degraded mode banner (shown while serving stale data)
+        self.degraded_text = ft.Text("", size=14, color=ft.Colors.AMBER_900)
+        self.degraded_banner = ft.Container(
+            content=ft.Row(
+                [
+                    ft.Icon(ft.Icons.CLOUD_OFF, color=ft.Colors.AMBER_900),
+                    self.degraded_text,
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=8,
+            ),
+            bgcolor=ft.Colors.AMBER_100,
+            border_radius=12,
+            padding=15,
+            width=800,
+            visible=False,
+        )
         
         # Loading indicator
         self.loading = ft.ProgressRing(visible=False)
@@ -241,9 +345,11 @@ class WeatherApp:
             content=ft.Column(
                 [
                     self.loading,
+                    self.degraded_banner,
                     self.error_message,
                     self.weather_container,
                     self.forecast_container,
+                    self.chart_container,
                     self.info_box,
                 ],
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -253,15 +359,36 @@ class WeatherApp:
             expand=True,
         )
 
+        # Single-city view
+        self.city_view = ft.Column(
+            [
+                city_row,
+                self.history_section,
+                ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
+                scroll_area,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=10,
+            expand=True,
+        )
+
+        # Multi-city dashboard (hidden initially)
+        self.dashboard = DashboardView(
+            self.weather_service,
+            self.watch_list_store,
+            visible_rows=Config.DASHBOARD_VISIBLE_ROWS,
+            concurrency=Config.DASHBOARD_CONCURRENCY,
+            unit_system=self.unit_system,
+            weather_store=self.weather_store,
+        )
+
         self.page.add(
             ft.Column(
                     [
                         title_row,
                         ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
-                        city_row,
-                        self.history_section,
-                        ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
-                        scroll_area,
+                        self.city_view,
+                        self.dashboard.control,
                     ],
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                 spacing=10,
@@ -284,6 +411,31 @@ class WeatherApp:
             self.theme_button.icon = ft.Icons.DARK_MODE
         self.page.update()
 
+    def toggle_dashboard(self, e):
+        """Switch between the single-city view and the watch list."""
+        showing = not self.dashboard.control.visible
+        self.dashboard.control.visible = showing
+        self.city_view.visible = not showing
+        self.dashboard_button.icon = (
+            ft.Icons.DASHBOARD if showing else ft.Icons.DASHBOARD_OUTLINED
+        )
+        self.page.update()
+        if showing:
+            self.page.run_task(self.dashboard.refresh_all)
+
+    async def toggle_units(self, e):
+        """Switch display units and re-render from the data already loaded."""
+        self.unit_system = units.next_system(self.unit_system)
+        self.unit_button.text = units.label("temperature", self.unit_system)
+        self.dashboard.set_unit_system(self.unit_system)
+
+        if self.current_weather:
+            await self.display_weather(self.current_weather, refresh=True)
+        if self.current_forecast:
+            await self.display_forecast(self.current_forecast)
+            self.render_hourly_chart(reset_view=False)
+        self.page.update()
+
     async def on_search_async(self, e):
         """Async event handler."""
         await self.get_weather()
@@ -302,31 +454,43 @@ class WeatherApp:
             self.show_error("Please enter a city name")
             return
 
-        # Show loading, hide previous results
-        self.loading.visible = True
+        # Show loading unless prefetched data will render right away;
+        # previous results stay until new ones arrive
+        self.loading.visible = not (
+            self.weather_service.is_cached(city)
+            and self.weather_service.is_cached(city, forecast=True)
+        )
         self.error_message.visible = False
-        self.weather_container.visible = False
         self.page.update()
         
         try:
             # Fetch weather data
             weather_data = await self.weather_service.get_weather(city)
             
+            # Record snapshot for trends
+            self.record_observation(weather_data)
+
             # Add to history
             self.add_to_history(city)
             self.update_history_dropdown()
+            self.prefetcher.record(city)
             
             # Display weather
             await self.display_weather(weather_data)
             forecast_data = await self.weather_service.get_forecast(city)
             await self.display_forecast(forecast_data)
+            await self.display_hourly_chart(forecast_data)
             
+        except ServiceUnavailableError as e:
+            # Keep showing the last good result during outages
+            self.show_error(str(e), hide_result=False)
         except Exception as e:
             self.show_error(str(e))
         
         finally:
             self.loading.visible = False
             self.page.update()
+            self.prefetcher.schedule_idle(self.search_history)
     
     async def get_location_weather(self):
         """Get weather for current location."""
@@ -344,8 +508,17 @@ class WeatherApp:
         except Exception as e:
             self.show_error("Could not get your location")
     
-    async def display_weather(self, data: dict):
-        """Display weather information."""
+    async def display_weather(self, data: dict, refresh: bool = False):
+        """
+        Display weather information.
+
+        Args:
+            data: Current weather payload (metric units)
+            refresh: Re-render existing data, e.g. after a unit switch,
+                without alerts or the fade-in animation
+        """
+        self.current_weather = data
+
         # Extract data
         city_name = data.get("name", "Unknown")
         country = data.get("sys", {}).get("country", "")
@@ -360,8 +533,10 @@ class WeatherApp:
         icon_code = data.get("weather", [{}])[0].get("icon", "01d")
         wind_speed = data.get("wind", {}).get("speed", 0)
 
+        self.update_degraded_banner(data)
+
         temp = data.get("main", {}).get("temp", 0)
-        if temp > 35:
+        if temp > 35 and not refresh:
             alert = ft.Banner(
                 bgcolor=ft.Colors.AMBER_100,
                 leading=ft.Icon(ft.Icons.WARNING, color=ft.Colors.AMBER, size=40),
@@ -375,6 +550,15 @@ class WeatherApp:
         self.weather_container.border_radius = 12
         self.weather_container.padding = 30
         self.weather_container.width = 700
+
+        # Convert from the canonical metric data for display
+        system = self.unit_system
+        temp, feels_like, temp_max, temp_min = units.convert(
+            "temperature", [temp, feels_like, temp_max, temp_min], system
+        )
+        wind_speed = units.convert_one("speed", wind_speed, system)
+        pressure = units.convert_one("pressure", pressure, system)
+        temp_unit = units.label("temperature", system)
     
         # Build weather display
         location = ft.Row(
@@ -403,20 +587,20 @@ class WeatherApp:
                             color=ft.Colors.GREY_800,
                             )
         temp_text = ft.Text(
-            f"{temp:.1f}°C",
+            f"{temp:.1f}{temp_unit}",
             size=48,
             weight=ft.FontWeight.BOLD,
             color=ft.Colors.BLUE_900,
         )
 
         feels_like_text = ft.Text(
-            f"Feels like {feels_like:.1f}°C",
+            f"Feels like {feels_like:.1f}{temp_unit}",
             size=16,
             color=ft.Colors.GREY_700,
         )
 
         min_max_text =  ft.Text(
-                    f"↑ {temp_max:.1f}°C  ↓ {temp_min:.1f}°C",
+                    f"↑ {temp_max:.1f}{temp_unit}  ↓ {temp_min:.1f}{temp_unit}",
                     size=16,
                     color=ft.Colors.GREY_700,
                 )
@@ -434,10 +618,17 @@ class WeatherApp:
                     ft.Icons.WATER_DROP, "Humidity", f"{humidity}%", ft.Colors.BLUE_400
                 ),
                 self.create_info_card(
-                    ft.Icons.AIR, "Wind Speed", f"{wind_speed} m/s", ft.Colors.TEAL_300
+                    ft.Icons.AIR,
+                    "Wind Speed",
+                    f"{wind_speed:.1f} {units.label('speed', system)}",
+                    ft.Colors.TEAL_300,
                 ),  
                 self.create_info_card(
-                    ft.Icons.COMPRESS, "Pressure", f"{pressure} hPa", ft.Colors.PURPLE_400
+                    ft.Icons.COMPRESS,
+                    "Pressure",
+                    f"{pressure:.{2 if system == 'imperial' else 0}f} "
+                    f"{units.label('pressure', system)}",
+                    ft.Colors.PURPLE_400,
                 ),
                 self.create_info_card(
                     ft.Icons.CLOUD, "Cloudiness", f"{cloudiness}%", ft.Colors.GREY_700
@@ -461,6 +652,9 @@ class WeatherApp:
         )
 
         
+        if refresh:
+            return
+
         self.weather_container.animate_opacity = 300
         self.weather_container.opacity = 0
         self.weather_container.visible = True
@@ -473,6 +667,8 @@ class WeatherApp:
         self.page.update()
 
     async def display_forecast(self, data: dict):
+        self.current_forecast = data
+        temp_unit = units.label("temperature", self.unit_system)
         forecast_list = data.get("list", [])
         daily = {}
 
@@ -485,8 +681,11 @@ class WeatherApp:
 
         cards = []
         for date, info in daily.items():
-            temp_min = info["main"]["temp_min"]
-            temp_max = info["main"]["temp_max"]
+            temp_min, temp_max = units.convert(
+                "temperature",
+                [info["main"]["temp_min"], info["main"]["temp_max"]],
+                self.unit_system,
+            )
             desc = info["weather"][0]["description"].title()
             icon = info["weather"][0]["icon"]
 
@@ -500,8 +699,8 @@ class WeatherApp:
                             height=60,
                         ),
                         ft.Text(desc, size=14),
-                        ft.Text(f"High: {temp_max:.1f}°C", size=14),
-                        ft.Text(f"Low: {temp_min:.1f}°C", size=14),
+                        ft.Text(f"High: {temp_max:.1f}{temp_unit}", size=14),
+                        ft.Text(f"Low: {temp_min:.1f}{temp_unit}", size=14),
                     ],
                     horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                     spacing=6,
@@ -538,7 +737,39 @@ class WeatherApp:
         self.forecast_container.visible = True
         self.page.update()
 
-        
+
+    async def display_hourly_chart(self, data: dict):
+        """Display hourly temperature and precipitation chart."""
+        city = data.get("city", {})
+        temps, precip = forecast_series(data)
+        try:
+            key = city_key(city.get("name", ""), city.get("country", ""))
+            history = history_series(
+                self.weather_store, key, Config.CHART_HISTORY_DAYS
+            )
+        except (OSError, ValueError):
+            history = []
+
+        self.chart_series = (history + temps, precip)
+        self.render_hourly_chart()
+        self.chart_container.visible = True
+        self.page.update()
+
+    def render_hourly_chart(self, reset_view: bool = True):
+        """Push the stored chart series in the current display units."""
+        temps, precip = self.chart_series
+        converted = units.convert(
+            "temperature", [y for _, y in temps], self.unit_system
+        )
+        self.forecast_chart.set_temp_unit(
+            units.label("temperature", self.unit_system)
+        )
+        self.forecast_chart.set_series(
+            [(x, y) for (x, _), y in zip(temps, converted)],
+            precip,
+            reset_view=reset_view,
+        )
+
     def create_info_card(self, icon, label, value, icon_color):
         """Create an info card for weather details."""
         return ft.Container(
@@ -570,18 +801,88 @@ class WeatherApp:
             ),
         )
     
-    def show_error(self, message: str):
+    def show_error(self, message: str, hide_result: bool = True):
         """Display error message."""
         self.error_message.value = f"❌ {message}"
         self.error_message.visible = True
-        self.weather_container.visible = False
+        if hide_result:
+            self.weather_container.visible = False
         self.page.update()
 
+    def update_degraded_banner(self, data: dict):
+        """Show or hide the offline banner depending on data freshness."""
+        stale = data.get("_stale")
+        if stale:
+            minutes = int(stale["age"] // 60)
+            age = f"{minutes} min ago" if minutes else "less than a minute ago"
+            self.degraded_text.value = (
+                f"Weather service unreachable. Showing data from {age}."
+            )
+        self.degraded_banner.visible = bool(stale)
+
     
+# Shared by every session in web mode
+_shared_service: Optional[WeatherService] = None
+_shared_store: Optional[WeatherStore] = None
+_shared_prefetch_budget: Optional[CallBudget] = None
+# Flet runs sync session handlers on a thread pool
+_shared_lock = threading.Lock()
+_watchdog: Optional[LoopWatchdog] = None
+
+
+async def start_watchdog():
+    """Start the event loop watchdog once per process, if enabled."""
+    global _watchdog
+    if not Config.WATCHDOG_ENABLED or _watchdog is not None:
+        return
+    logging.basicConfig(level=logging.INFO)
+    _watchdog = LoopWatchdog(
+        threshold=Config.WATCHDOG_THRESHOLD_MS / 1000,
+        export_file=Config.WATCHDOG_EXPORT_FILE,
+        summary_interval=Config.WATCHDOG_SUMMARY_SECONDS,
+        handler_classes=(WeatherApp, DashboardView),
+    )
+    _watchdog.start()
+    # The watchdog is process-wide, so it stops with the process rather
+    # than with any one session
+    atexit.register(_watchdog.stop)
+
+
 def main(page: ft.Page):
     """Main entry point."""
+    page.run_task(start_watchdog)
     WeatherApp(page)
 
 
+def web_main(page: ft.Page):
+    """
+    Entry point for multi-session web mode.
+
+    All sessions share one WeatherService (connection pool, cache,
+    in-flight requests and quota), one WeatherStore and one prefetch
+    budget, while search history and the watch list are kept in each
+    user's browser storage so they survive reloads.
+    """
+    global _shared_service, _shared_store, _shared_prefetch_budget
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = WeatherService()
+            _shared_store = WeatherStore(Config.STORE_DIR)
+            _shared_prefetch_budget = CallBudget(Config.PREFETCH_BUDGET_PER_HOUR)
+
+    page.run_task(start_watchdog)
+    WeatherApp(
+        page,
+        weather_service=_shared_service,
+        weather_store=_shared_store,
+        history_store=ClientStorageStore(page, "search_history"),
+        watch_list_store=ClientStorageStore(page, "watch_list"),
+        prefetch_budget=_shared_prefetch_budget,
+    )
+
+
 if __name__ == "__main__":
-    ft.app(target=main)                                                                                                      # weather_service.py
+    if "--web" in sys.argv:
+        ft.app(target=web_main, view=ft.AppView.WEB_BROWSER, port=Config.WEB_PORT)
+    else:
+        ft.app(target=main)                                                                                                      # weather_service.py
@@ -0,0 +1,130 @@
+# prefetch.py
+"""Warm the weather cache for cities the user is likely to pick next."""
+
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Iterable, List, Optional
+
+from weather_service import WeatherService, WeatherServiceError
+
+
+class CallBudget:
+    """Caps how many upstream calls prefetching may spend per period."""
+
+    def __init__(self, calls: int, period: float = 3600):
+        self.calls = calls
+        self.period = period
+        self._spent = deque()
+
+    def remaining(self) -> int:
+        now = time.monotonic()
+        while self._spent and now - self._spent[0] >= self.period:
+            self._spent.popleft()
+        return self.calls - len(self._spent)
+
+    def spend(self, calls: int = 1) -> bool:
+        """Consume calls if they fit in the budget."""
+        if self.remaining() < calls:
+            return False
+        now = time.monotonic()
+        self._spent.extend([now] * calls)
+        return True
+
+
+class Prefetcher:
+    """
+    Fetches weather and forecast ahead of time so picks render instantly.
+
+    Cities are warmed when the app has been idle for a while (most
+    frequent and most recent history first) and whenever the UI signals
+    intent, such as opening the history dropdown. Only cache misses that
+    are not already being fetched are charged to the budget.
+    """
+
+    def __init__(
+        self,
+        weather_service: WeatherService,
+        budget: CallBudget,
+        idle_delay: float,
+        top_n: int,
+    ):
+        self.weather_service = weather_service
+        self.budget = budget
+        self.idle_delay = idle_delay
+        self.top_n = top_n
+        self.picks = Counter()
+        self._warming = set()
+        self._idle_task: Optional[asyncio.Task] = None
+        self._tasks = set()
+
+    def record(self, city: str):
+        """Count a city the user actually looked up."""
+        self.picks[city.strip().lower()] += 1
+
+    def rank(self, history: List[str]) -> List[str]:
+        """Order history by how often, then how recently, it was picked."""
+        order = {city: i for i, city in enumerate(history)}
+        return sorted(
+            history,
+            key=lambda city: (-self.picks[city.strip().lower()], order[city]),
+        )
+
+    async def warm(self, city: str) -> bool:
+        """
+        Fetch weather and forecast for city unless already cached.
+
+        Returns:
+            True if anything was fetched
+        """
+        key = city.strip().lower()
+        if key in self._warming:
+            return False
+
+        service = self.weather_service
+        missing = [
+            fetch for fetch, forecast in (
+                (service.get_weather, False),
+                (service.get_forecast, True),
+            )
+            if not service.is_cached(city, forecast)
+            and not service.is_pending(city, forecast)
+        ]
+        if not missing or not self.budget.spend(len(missing)):
+            return False
+
+        self._warming.add(key)
+        try:
+            await asyncio.gather(*[fetch(city) for fetch in missing])
+        except WeatherServiceError:
+            # Prefetching is opportunistic; the real search reports errors
+            return False
+        finally:
+            self._warming.discard(key)
+        return True
+
+    async def warm_many(self, cities: Iterable[str]):
+        """Warm several cities one after another."""
+        for city in cities:
+            await self.warm(city)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def on_intent(self, cities: Iterable[str]):
+        """Warm cities the user is about to choose from."""
+        self._spawn(self.warm_many(list(cities)[:self.top_n]))
+
+    def schedule_idle(self, history: List[str]):
+        """(Re)start the idle timer; warm top history entries when it fires."""
+        if self._idle_task and not self._idle_task.done():
+            self._idle_task.cancel()
+
+        async def run():
+            await asyncio.sleep(self.idle_delay)
+            await self.warm_many(self.rank(history)[:self.top_n])
+
+        self._idle_task = self._spawn(run())
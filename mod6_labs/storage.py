@@ -0,0 +1,55 @@
+# storage.py
+"""Where per-user state (search history, watch list) is kept."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import flet as ft
+
+
+class FileStore:
+    """A JSON value kept in a local file (desktop mode)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self, default: Any = None) -> Any:
+        """Return the saved value, or default if nothing was saved."""
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                return json.load(f)
+        return default
+
+    def save(self, value: Any):
+        """Save a JSON-serializable value."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(value, f)
+
+
+class ClientStorageStore:
+    """
+    A JSON value kept in the browser's local storage (web mode).
+
+    State lives with the user rather than the server session, so it
+    survives page reloads and leaves nothing behind on disk.
+    """
+
+    def __init__(self, page: ft.Page, key: str):
+        self.page = page
+        self.key = f"weather_app.{key}"
+
+    def load(self, default: Any = None) -> Any:
+        """
+        Return the saved value, or default if nothing was saved.
+
+        This waits for the browser to answer, so call it from the
+        session's handler thread, never from the event loop.
+        """
+        value = self.page.client_storage.get(self.key)
+        return default if value is None else value
+
+    def save(self, value: Any):
+        """Save a JSON-serializable value without waiting for the browser."""
+        self.page.run_task(self.page.client_storage.set_async, self.key, value)
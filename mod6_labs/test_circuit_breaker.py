@@ -0,0 +1,88 @@
+# test_circuit_breaker.py
+"""Simple tests for the circuit breaker."""
+
+from circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_threshold():
+    """Test that consecutive failures open the circuit."""
+    breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    print("✅ Circuit opens after repeated failures")
+
+
+def test_success_resets_failures():
+    """Test that a success in between resets the failure count."""
+    breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    print("✅ Successes reset the failure count")
+
+
+def test_half_open_trial():
+    """Test half-open trial requests after the reset timeout."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 29
+    assert not breaker.allow_request()
+
+    clock.now = 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one trial at a time
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    print("✅ Half-open trial closes the circuit on success")
+
+
+def test_half_open_failure_reopens():
+    """Test that a failed trial opens the circuit again."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    print("✅ Failed trial reopens the circuit")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Circuit Breaker Tests\n")
+    print("=" * 50)
+
+    test_opens_after_threshold()
+    test_success_resets_failures()
+    test_half_open_trial()
+    test_half_open_failure_reopens()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
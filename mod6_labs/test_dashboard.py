@@ -0,0 +1,155 @@
+# test_dashboard.py
+"""Simple tests for the virtualized dashboard row pool."""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("OPENWEATHER_API_KEY", "test")
+
+from dashboard import DashboardView
+from storage import FileStore
+from weather_store import WeatherStore
+
+
+def payload(city, temp=20.0, dt=1_700_000_000):
+    """Build a minimal OpenWeatherMap-style payload."""
+    return {
+        "name": city,
+        "dt": dt,
+        "sys": {"country": ""},
+        "main": {"temp": temp, "humidity": 50, "pressure": 1010},
+        "wind": {"speed": 2},
+        "weather": [{"id": 800, "main": "Clear", "description": "clear sky"}],
+    }
+
+
+class FakeService:
+    """Weather service stand-in returning canned payloads."""
+
+    def __init__(self, stale=()):
+        self.stale = set(stale)
+
+    async def get_weather(self, city):
+        data = payload(city)
+        if city in self.stale:
+            data["_stale"] = {"age": 900}
+        return data
+
+
+def make_dashboard(root, cities, visible_rows=10, **kwargs):
+    """Build a dashboard whose watch list is saved in a temp dir."""
+    store = FileStore(Path(root) / "watch_list.json")
+    store.save(cities)
+    return DashboardView(
+        kwargs.pop("service", FakeService()), store, visible_rows, 5, **kwargs
+    )
+
+
+def bound_cities(dashboard):
+    return [row.city for row in dashboard.rows if row.control.visible]
+
+
+def test_row_pool_is_fixed():
+    """Test that 500 cities are shown through only visible_rows rows."""
+    with tempfile.TemporaryDirectory() as root:
+        cities = [f"City {i:03}" for i in range(500)]
+        dashboard = make_dashboard(root, cities)
+        assert len(dashboard.rows) == 10
+        assert len(dashboard.list_view.controls) == 10
+        assert bound_cities(dashboard) == cities[:10]
+
+        dashboard.scroll_to(250)
+        assert len(dashboard.list_view.controls) == 10
+        assert bound_cities(dashboard) == cities[250:260]
+        assert set(dashboard.slots) == {c.lower() for c in cities[250:260]}
+
+        # Offsets past either end are clamped
+        dashboard.scroll_to(10_000)
+        assert dashboard.offset == 490
+        assert dashboard.count_text.value == "491–500 of 500"
+        dashboard.scroll_to(-5)
+        assert dashboard.offset == 0
+        print("✅ Row pool stays fixed while scrolling")
+
+
+def test_sort_and_filter_rebind_rows():
+    """Test that sorting and filtering re-bind the pool from the top."""
+    with tempfile.TemporaryDirectory() as root:
+        cities = [f"City {i:03}" for i in range(500)]
+        dashboard = make_dashboard(root, cities)
+        dashboard.scroll_to(100)
+
+        dashboard.sort_dropdown.value = "Coldest"
+        for i, city in enumerate(cities[:3]):
+            dashboard.watch_list.update(city, payload(city, temp=-10.0 - i))
+        dashboard.on_sort(None)
+        assert dashboard.offset == 0
+        assert bound_cities(dashboard)[:3] == ["City 002", "City 001", "City 000"]
+
+        dashboard.filter_input.value = "City 49"
+        dashboard.on_filter(None)
+        assert bound_cities(dashboard) == [f"City {i}" for i in range(490, 500)]
+        assert set(dashboard.slots) == {f"city {i}" for i in range(490, 500)}
+        assert dashboard.count_text.value == "1–10 of 10"
+        print("✅ Sort and filter re-bind the row pool")
+
+
+def test_off_screen_updates_skip_rows():
+    """Test that new data only touches the row of an on-screen city."""
+    with tempfile.TemporaryDirectory() as root:
+        cities = [f"City {i:03}" for i in range(500)]
+        dashboard = make_dashboard(root, cities)
+
+        binds = []
+        for row in dashboard.rows:
+            row.bind = lambda entry, unit_system, bind=row.bind: (
+                binds.append(entry.name), bind(entry, unit_system)
+            )
+
+        entry = dashboard.watch_list.update("City 300", payload("City 300"))
+        dashboard.on_city_data(entry)
+        assert binds == []
+        assert bound_cities(dashboard) == cities[:10]
+
+        entry = dashboard.watch_list.update("City 005", payload("City 005"))
+        dashboard.on_city_data(entry)
+        assert binds == ["City 005"]
+        assert dashboard.rows[5].temp.value == "20.0°C"
+        print("✅ Off-screen updates do not re-bind rows")
+
+
+def test_fetches_are_recorded():
+    """Test that fresh dashboard fetches reach the weather store."""
+    with tempfile.TemporaryDirectory() as root:
+        weather_store = WeatherStore(Path(root) / "store")
+        dashboard = make_dashboard(
+            root, ["Oslo", "Lima"],
+            service=FakeService(stale={"Lima"}),
+            weather_store=weather_store,
+        )
+
+        asyncio.run(dashboard.refresh_all())
+
+        assert len(weather_store.query("oslo")) == 1
+        # Stale data is a repeat of an earlier snapshot
+        assert weather_store.query("lima") == []
+        print("✅ Fresh dashboard fetches are recorded")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Dashboard Tests\n")
+    print("=" * 50)
+
+    test_row_pool_is_fixed()
+    test_sort_and_filter_rebind_rows()
+    test_off_screen_updates_skip_rows()
+    test_fetches_are_recorded()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,47 @@
+# test_downsample.py
+"""Simple tests for chart downsampling."""
+
+import math
+from downsample import lttb
+
+
+def test_small_series_unchanged():
+    """Test that series under the threshold are returned as-is."""
+    points = [(x, x * 2) for x in range(10)]
+    assert lttb(points, 20) == points
+    print("✅ Small series are left unchanged")
+
+
+def test_reduces_to_threshold():
+    """Test that long series are reduced to the threshold."""
+    points = [(x, math.sin(x / 50)) for x in range(10_000)]
+    sampled = lttb(points, 640)
+    assert len(sampled) == 640
+    assert sampled[0] == points[0]
+    assert sampled[-1] == points[-1]
+    assert [p[0] for p in sampled] == sorted(p[0] for p in sampled)
+    print("✅ Long series are reduced to the threshold")
+
+
+def test_keeps_spikes():
+    """Test that an isolated spike survives downsampling."""
+    points = [(x, 0.0) for x in range(1000)]
+    points[500] = (500, 100.0)
+    assert (500, 100.0) in lttb(points, 50)
+    print("✅ Spikes are preserved")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Downsample Tests\n")
+    print("=" * 50)
+
+    test_small_series_unchanged()
+    test_reduces_to_threshold()
+    test_keeps_spikes()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
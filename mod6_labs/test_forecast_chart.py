@@ -0,0 +1,106 @@
+# test_forecast_chart.py
+"""Simple tests for the hourly forecast chart."""
+
+import tempfile
+from forecast_chart import ForecastChart, forecast_series, history_series
+from weather_store import Observation, WeatherStore
+
+NOW = 1_700_000_000
+
+
+def make_forecast(count):
+    """Build a minimal 3-hourly forecast payload starting now."""
+    return {
+        "list": [
+            {
+                "dt": NOW + i * 10800,
+                "main": {"temp": 10 + i},
+                "rain": {"3h": 1.5} if i % 2 else {},
+                **({"snow": {"3h": 0.5}} if i == 3 else {}),
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def test_forecast_series():
+    """Test extracting hour offsets, temperatures and precipitation."""
+    temps, precip = forecast_series(make_forecast(4), now=NOW)
+    assert temps == [(0, 10), (3, 11), (6, 12), (9, 13)]
+    assert precip == [(0, 0), (3, 1.5), (6, 0), (9, 2.0)]
+    assert forecast_series({}, now=NOW) == ([], [])
+    print("✅ Forecast series are extracted")
+
+
+def test_history_series():
+    """Test hourly history relative to now, limited to the last days."""
+    with tempfile.TemporaryDirectory() as root:
+        store = WeatherStore(root)
+        base = NOW - NOW % 3600
+        # Too old, then two samples in each of the last two hours
+        for timestamp, temp in (
+            (base - 3 * 86400, 0.0),
+            (base - 7200, 10.0), (base - 6600, 12.0),
+            (base - 3600, 20.0), (base - 3000, 22.0),
+        ):
+            store.append_observation("x", Observation(timestamp, temp, 0, 0, 0, 0))
+
+        assert history_series(store, "x", days=2, now=base) == [
+            (-2, 11.0), (-1, 21.0),
+        ]
+        assert history_series(store, "missing", days=2, now=base) == []
+        print("✅ History series are hourly and relative to now")
+
+
+def test_visible_window():
+    """Test that only the points in view are sent, downsampled."""
+    chart = ForecastChart(width=50)
+    temps = [(x / 10, float(x)) for x in range(-1000, 1000)]
+    chart.set_series(temps, [])
+    assert (chart.view_start, chart.view_end) == (-100, 99.9)
+    assert len(chart.visible(chart.temps, chart.temp_xs)) == 50
+
+    chart.view_start, chart.view_end = 10, 12
+    window = chart.visible(chart.temps, chart.temp_xs)
+    assert window == [(x / 10, float(x)) for x in range(100, 121)]
+    print("✅ Visible window is sliced and downsampled")
+
+
+def test_pan_and_zoom_are_clamped():
+    """Test that the view never leaves the loaded data."""
+    chart = ForecastChart(width=50)
+    chart.set_series([(x, 0.0) for x in range(-48, 121)], [(0, 0.0), (130, 1.0)])
+    assert (chart.view_start, chart.view_end) == (-48, 130)
+
+    chart.zoom(2)
+    assert (chart.view_start, chart.view_end) == (-48, 130)
+
+    chart.zoom(0.25)
+    span = chart.view_end - chart.view_start
+    for _ in range(10):
+        chart.pan(0.5)
+    assert chart.view_end == 130
+    assert chart.view_end - chart.view_start == span
+
+    for _ in range(10):
+        chart.pan(-0.5)
+    assert chart.view_start == -48
+    assert chart.view_end - chart.view_start == span
+    print("✅ Pan and zoom stay within the data")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Forecast Chart Tests\n")
+    print("=" * 50)
+
+    test_forecast_series()
+    test_history_series()
+    test_visible_window()
+    test_pan_and_zoom_are_clamped()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
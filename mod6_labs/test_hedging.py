@@ -0,0 +1,115 @@
+# test_hedging.py
+"""Simple tests for hedged requests."""
+
+import asyncio
+from hedging import HedgePolicy, hedged
+
+
+def warmed_policy(latency=0.01, **kwargs):
+    """Build a policy that has already seen some fast requests."""
+    policy = HedgePolicy(min_delay=0.01, min_samples=5, **kwargs)
+    for _ in range(5):
+        policy.record(latency)
+    policy.tokens = 5
+    return policy
+
+
+def test_no_hedge_without_samples():
+    """Test that nothing is hedged before latency is known."""
+    policy = HedgePolicy(min_samples=5)
+    calls = []
+
+    async def request():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    assert asyncio.run(hedged(request, policy)) == "ok"
+    assert len(calls) == 1
+    print("✅ No hedging before the delay is known")
+
+
+def test_slow_request_is_hedged():
+    """Test that a slow primary is beaten by the hedge."""
+    policy = warmed_policy()
+    delays = [1.0, 0.01]
+    cancelled = []
+
+    async def request():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    async def run():
+        start = asyncio.get_running_loop().time()
+        result = await hedged(request, policy)
+        return result, asyncio.get_running_loop().time() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result == 0.01
+    assert elapsed < 0.5
+    assert cancelled == [1.0]
+    assert policy.hedges == 1
+    print("✅ Slow requests are hedged and the loser cancelled")
+
+
+def test_budget_limits_hedges():
+    """Test that hedges stop once the budget is spent."""
+    policy = warmed_policy(budget_ratio=0.1)
+    policy.tokens = 0
+    # Keep the hedge delay at 10ms so every request would qualify
+    policy.record = lambda seconds: None
+    calls = []
+
+    async def request():
+        calls.append(1)
+        await asyncio.sleep(0.03)
+        return "ok"
+
+    async def run():
+        for _ in range(10):
+            await hedged(request, policy)
+
+    asyncio.run(run())
+    # Ten requests earn exactly one hedge
+    assert policy.hedges == 1
+    assert len(calls) == 11
+    print("✅ Budget limits extra requests")
+
+
+def test_failed_primary_falls_back_to_hedge():
+    """Test that a failing copy does not hide a successful one."""
+    policy = warmed_policy()
+    outcomes = [ValueError("slow failure"), "ok"]
+
+    async def request():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            await asyncio.sleep(0.05)
+            raise outcome
+        await asyncio.sleep(0.1)
+        return outcome
+
+    assert asyncio.run(hedged(request, policy)) == "ok"
+    print("✅ A failed copy falls back to the other")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Hedging Tests\n")
+    print("=" * 50)
+
+    test_no_hedge_without_samples()
+    test_slow_request_is_hedged()
+    test_budget_limits_hedges()
+    test_failed_primary_falls_back_to_hedge()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
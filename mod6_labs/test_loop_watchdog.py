@@ -0,0 +1,158 @@
+# test_loop_watchdog.py
+"""Simple tests for the event loop watchdog."""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from loop_watchdog import LoopWatchdog
+from storage import FileStore
+
+
+def save_history_slowly():
+    """Stand-in for a blocking handler such as a slow file write."""
+    time.sleep(0.3)
+
+
+def test_detects_blocking_call():
+    """Test that a blocking call is caught with its handler name."""
+    with tempfile.TemporaryDirectory() as root:
+        export_file = Path(root) / "events.jsonl"
+        watchdog = LoopWatchdog(threshold=0.1, interval=0.02, export_file=export_file)
+
+        async def run():
+            watchdog.start()
+            await asyncio.sleep(0.1)
+            save_history_slowly()
+            await asyncio.sleep(0.1)
+            watchdog.stop()
+
+        asyncio.run(run())
+
+        assert len(watchdog.events) == 1
+        event = watchdog.events[0]
+        assert event["handler"] == event["site"] == "save_history_slowly"
+        assert event["duration_ms"] >= 250
+        exported = json.loads(export_file.read_text().splitlines()[0])
+        assert exported["type"] == "block"
+        assert exported["handler"] == "save_history_slowly"
+        print("✅ Blocking calls are detected and exported")
+
+
+class WeatherApp:
+    """Stand-in for main.WeatherApp saving history through a store."""
+
+    def __init__(self, history_store):
+        self.history_store = history_store
+
+    def save_history(self):
+        self.history_store.save(["London"])
+
+
+def test_reports_handler_and_site():
+    """Test that a block deep inside a helper is charged to the app handler."""
+    with tempfile.TemporaryDirectory() as root:
+        path = Path(root) / "history.json"
+        # Writing to a FIFO blocks until something reads from it
+        os.mkfifo(path)
+        reader = threading.Timer(0.3, path.read_text)
+        watchdog = LoopWatchdog(
+            threshold=0.1, interval=0.02, handler_classes=(WeatherApp,)
+        )
+
+        async def run():
+            watchdog.start()
+            await asyncio.sleep(0.1)
+            reader.start()
+            WeatherApp(FileStore(path)).save_history()
+            await asyncio.sleep(0.1)
+            watchdog.stop()
+
+        asyncio.run(run())
+        reader.join()
+
+        assert len(watchdog.events) == 1
+        event = watchdog.events[0]
+        assert event["handler"] == "save_history"
+        assert event["site"] == "save"
+        assert watchdog.summary()["handlers"]["save_history"]["count"] == 1
+        print("✅ Blocking events name the handler and the blocking site")
+
+
+def test_histogram_counts_lag():
+    """Test that heartbeats fill the lag histogram."""
+    watchdog = LoopWatchdog(threshold=0.5, interval=0.01)
+
+    async def run():
+        watchdog.start()
+        await asyncio.sleep(0.2)
+        watchdog.stop()
+
+    asyncio.run(run())
+
+    summary = watchdog.summary()
+    assert sum(summary["lag_histogram"].values()) > 5
+    assert summary["blocking_events"] == 0
+    print("✅ Lag histogram is recorded")
+
+
+def test_summary_exported_periodically():
+    """Test that lag summaries reach the export file on a schedule and on stop."""
+    with tempfile.TemporaryDirectory() as root:
+        export_file = Path(root) / "events.jsonl"
+        watchdog = LoopWatchdog(
+            threshold=0.5, interval=0.01,
+            export_file=export_file, summary_interval=0.05,
+        )
+
+        async def run():
+            watchdog.start()
+            await asyncio.sleep(0.2)
+            periodic = len(export_file.read_text().splitlines())
+            watchdog.stop()
+            return periodic
+
+        periodic = asyncio.run(run())
+        records = [json.loads(line) for line in export_file.read_text().splitlines()]
+
+        assert periodic >= 2
+        assert len(records) == periodic + 1
+        assert all(r["type"] == "summary" for r in records)
+        assert sum(records[-1]["lag_histogram"].values()) > 5
+        print("✅ Summaries are exported periodically and on stop")
+
+
+def test_recent_events_are_bounded():
+    """Test that only recent events stay in memory while all are counted."""
+    watchdog = LoopWatchdog(recent_events=3)
+    for i in range(10):
+        watchdog._finish_event(
+            {"started": time.monotonic(), "handler": f"h{i}", "site": "s", "stack": []},
+            time.monotonic(),
+        )
+
+    assert [e["handler"] for e in watchdog.events] == ["h7", "h8", "h9"]
+    assert watchdog.summary()["blocking_events"] == 10
+    assert len(watchdog.summary()["handlers"]) == 10
+    print("✅ Recent events are bounded")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Loop Watchdog Tests\n")
+    print("=" * 50)
+
+    test_detects_blocking_call()
+    test_reports_handler_and_site()
+    test_histogram_counts_lag()
+    test_summary_exported_periodically()
+    test_recent_events_are_bounded()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,132 @@
+# test_prefetch.py
+"""Simple tests for the prefetch budget and ranking."""
+
+import asyncio
+import os
+
+os.environ.setdefault("OPENWEATHER_API_KEY", "test")
+
+from prefetch import CallBudget, Prefetcher
+
+
+class FakeService:
+    """Weather service stand-in that records fetched cities."""
+
+    def __init__(self, cached=(), delay=0.0, pending=()):
+        self.cached = set(cached)
+        self.pending = set(pending)
+        self.delay = delay
+        self.fetched = []
+
+    def is_cached(self, city, forecast=False):
+        return (city, forecast) in self.cached
+
+    def is_pending(self, city, forecast=False):
+        return (city, forecast) in self.pending
+
+    async def get_weather(self, city):
+        self.fetched.append(("weather", city))
+        await asyncio.sleep(self.delay)
+        self.cached.add((city, False))
+
+    async def get_forecast(self, city):
+        self.fetched.append(("forecast", city))
+        await asyncio.sleep(self.delay)
+        self.cached.add((city, True))
+
+
+def test_budget():
+    """Test that the budget refuses calls beyond its limit."""
+    budget = CallBudget(3)
+    assert budget.spend(2)
+    assert not budget.spend(2)
+    assert budget.spend(1)
+    assert budget.remaining() == 0
+    print("✅ Budget caps prefetch calls")
+
+
+def test_rank_prefers_frequent():
+    """Test ranking by pick count, then recency."""
+    prefetcher = Prefetcher(FakeService(), CallBudget(10), idle_delay=0, top_n=3)
+    prefetcher.record("Tokyo")
+    prefetcher.record("tokyo")
+    prefetcher.record("Paris")
+    assert prefetcher.rank(["London", "Paris", "Tokyo"]) == ["Tokyo", "Paris", "London"]
+    print("✅ Ranking prefers frequent then recent cities")
+
+
+def test_warm_skips_cached():
+    """Test that only cache misses are fetched and charged."""
+    service = FakeService(cached=[("London", False)])
+    budget = CallBudget(10)
+    prefetcher = Prefetcher(service, budget, idle_delay=0, top_n=3)
+
+    assert asyncio.run(prefetcher.warm("London"))
+    assert service.fetched == [("forecast", "London")]
+    assert budget.remaining() == 9
+    assert not asyncio.run(prefetcher.warm("London"))
+    print("✅ Warm only fetches cache misses")
+
+
+def test_repeated_intent_while_in_flight():
+    """Test that keystrokes during a slow prefetch are not charged again."""
+    service = FakeService(delay=0.1)
+    budget = CallBudget(30)
+    prefetcher = Prefetcher(service, budget, idle_delay=0, top_n=3)
+
+    async def run():
+        # One intent per keystroke matching "London"
+        for _ in range(4):
+            prefetcher.on_intent(["London"])
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(run())
+    assert len(service.fetched) == 2
+    assert budget.remaining() == 28
+    print("✅ In-flight prefetches are not charged twice")
+
+
+def test_pending_search_not_charged():
+    """Test that requests already in flight in the service are skipped."""
+    service = FakeService(pending=[("London", False)])
+    budget = CallBudget(30)
+    prefetcher = Prefetcher(service, budget, idle_delay=0, top_n=3)
+
+    asyncio.run(prefetcher.warm("London"))
+    assert service.fetched == [("forecast", "London")]
+    assert budget.remaining() == 29
+    print("✅ Requests already in flight are not charged")
+
+
+def test_idle_warms_top_history():
+    """Test the idle timer warming the top ranked cities within budget."""
+    service = FakeService()
+    prefetcher = Prefetcher(service, CallBudget(4), idle_delay=0.01, top_n=3)
+
+    async def run():
+        prefetcher.schedule_idle(["London", "Paris", "Tokyo"])
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert {city for _, city in service.fetched} == {"London", "Paris"}
+    print("✅ Idle prefetch warms top cities within budget")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Prefetch Tests\n")
+    print("=" * 50)
+
+    test_budget()
+    test_rank_prefers_frequent()
+    test_warm_skips_cached()
+    test_repeated_intent_while_in_flight()
+    test_pending_search_not_charged()
+    test_idle_warms_top_history()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,51 @@
+# test_units.py
+"""Simple tests for display unit conversion."""
+
+from units import UNIT_SYSTEMS, convert, convert_one, label, next_system
+
+
+def test_temperature():
+    """Test temperature conversion for every unit system."""
+    assert convert("temperature", [0, 100], "metric") == [0, 100]
+    assert convert("temperature", [0, 100], "imperial") == [32, 212]
+    assert convert("temperature", [0], "standard") == [273.15]
+    print("✅ Temperatures convert correctly")
+
+
+def test_speed_and_pressure():
+    """Test wind speed and pressure conversion."""
+    assert round(convert_one("speed", 10, "imperial"), 2) == 22.37
+    assert convert_one("speed", 10, "standard") == 10
+    assert round(convert_one("pressure", 1013.25, "imperial"), 2) == 29.92
+    print("✅ Speed and pressure convert correctly")
+
+
+def test_labels_and_toggle():
+    """Test unit labels and the toggle order."""
+    assert label("temperature", "imperial") == "°F"
+    assert label("pressure", "metric") == "hPa"
+
+    system = "metric"
+    seen = []
+    for _ in UNIT_SYSTEMS:
+        seen.append(system)
+        system = next_system(system)
+    assert system == "metric"
+    assert sorted(seen) == sorted(UNIT_SYSTEMS)
+    print("✅ Labels and toggle order are correct")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Units Tests\n")
+    print("=" * 50)
+
+    test_temperature()
+    test_speed_and_pressure()
+    test_labels_and_toggle()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,94 @@
+# test_watch_list.py
+"""Simple tests for the dashboard watch list models."""
+
+import tempfile
+from pathlib import Path
+from storage import FileStore
+from watch_list import WatchList
+
+
+def payload(temp, condition="Clear", description="clear sky"):
+    """Build a minimal OpenWeatherMap-style payload."""
+    return {
+        "main": {"temp": temp},
+        "weather": [{"main": condition, "description": description, "icon": "01d"}],
+    }
+
+
+def make_watch_list():
+    watch_list = WatchList(["Tokyo", "london", "Cairo", "Oslo"])
+    watch_list.update("Tokyo", payload(18))
+    watch_list.update("London", payload(12, "Rain", "light rain"))
+    watch_list.update("Cairo", payload(34))
+    return watch_list
+
+
+def test_add_ignores_duplicates():
+    """Test that cities are de-duplicated case-insensitively."""
+    watch_list = WatchList(["London", " london ", ""])
+    assert len(watch_list) == 1
+    assert watch_list.add("LONDON") is None
+    print("✅ Duplicate cities are ignored")
+
+
+def test_sort_by_temperature():
+    """Test sorting with cities lacking data kept last."""
+    watch_list = make_watch_list()
+    watch_list.set_sort("temp", reverse=True)
+    assert [e.name for e in watch_list.visible] == ["Cairo", "Tokyo", "london", "Oslo"]
+    watch_list.set_sort("temp")
+    assert [e.name for e in watch_list.visible] == ["london", "Tokyo", "Cairo", "Oslo"]
+    print("✅ Sorting by temperature works")
+
+
+def test_filters():
+    """Test filtering by text and temperature band."""
+    watch_list = make_watch_list()
+    watch_list.set_filter("rain")
+    assert [e.name for e in watch_list.visible] == ["london"]
+
+    watch_list.set_filter(band="hot")
+    assert [e.name for e in watch_list.visible] == ["Cairo"]
+
+    watch_list.set_filter(band="mild")
+    assert [e.name for e in watch_list.visible] == ["london", "Tokyo"]
+    print("✅ Filters work")
+
+
+def test_window():
+    """Test slicing the visible entries for the row pool."""
+    watch_list = WatchList([f"City {i:03}" for i in range(500)])
+    window = watch_list.window(100, 10)
+    assert len(window) == 10
+    assert window[0].name == "City 100"
+    print("✅ Windowing works")
+
+
+def test_save_and_load():
+    """Test persisting the watch list."""
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(Path(root) / "watch_list.json")
+        make_watch_list().save(store)
+        assert [e.name for e in WatchList.load(store).entries] == [
+            "Tokyo", "london", "Cairo", "Oslo",
+        ]
+        assert WatchList.load(FileStore(Path(root) / "missing.json")).entries == []
+        print("✅ Save and load work")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Watch List Tests\n")
+    print("=" * 50)
+
+    test_add_ignores_duplicates()
+    test_sort_by_temperature()
+    test_filters()
+    test_window()
+    test_save_and_load()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
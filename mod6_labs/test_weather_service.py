@@ -2,7 +2,30 @@
 """Simple tests for weather service."""
 
 import asyncio
-from weather_service import WeatherService, WeatherServiceError
+import os
+import time
+
+from dotenv import load_dotenv
+
+# Mock tests need no real key; keep a real one from .env if present
+load_dotenv()
+os.environ.setdefault("OPENWEATHER_API_KEY", "test")
+
+import httpx
+from weather_service import RateLimiter, WeatherService, WeatherServiceError
+
+
+def make_service(handler):
+    """Create a WeatherService talking to a mock upstream."""
+    return WeatherService(transport=httpx.MockTransport(handler))
+
+
+def weather_json(request, temp=20.0):
+    """Build a minimal weather response for a mock request."""
+    return httpx.Response(200, json={
+        "name": request.url.params.get("q", "Unknown"),
+        "main": {"temp": temp},
+    })
 
 
 async def test_valid_city():
@@ -42,6 +65,370 @@ async def test_empty_city():
         return True
 
 
+def test_concurrent_requests_are_merged():
+    """Test that identical concurrent requests make one upstream call."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.params["q"])
+        await asyncio.sleep(0.05)
+        return weather_json(request)
+
+    async def run():
+        service = make_service(handler)
+        results = await asyncio.gather(
+            *[service.get_weather(city) for city in ["London", "london ", "LONDON"] * 10]
+        )
+        await service.close()
+        return results
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r["name"] == results[0]["name"] for r in results)
+    print("✅ Concurrent identical requests are merged")
+
+
+def test_cache_hit_within_ttl():
+    """Test that a cached response is reused until the TTL expires."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["q"])
+        return weather_json(request)
+
+    async def run():
+        service = make_service(handler)
+        await service.get_weather("London")
+        await service.get_weather("London")
+        await service.get_forecast("London")  # different endpoint
+        assert len(calls) == 2
+        assert service.is_cached("London")
+
+        service.cache_ttl = 0
+        await service.get_weather("London")
+        assert len(calls) == 3
+        await service.close()
+
+    asyncio.run(run())
+    print("✅ Cache hits make no upstream call")
+
+
+def test_rate_limiter_blocks_beyond_capacity():
+    """Test that calls beyond the quota wait for the bucket to refill."""
+    async def run():
+        limiter = RateLimiter(2, period=0.2)
+        start = time.monotonic()
+        await limiter.acquire()
+        await limiter.acquire()
+        assert time.monotonic() - start < 0.05
+        assert not limiter.try_acquire()
+
+        await limiter.acquire()  # must wait ~0.1s for one token
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
+    print("✅ Rate limiter blocks beyond capacity")
+
+
+def test_service_respects_quota():
+    """Test that the service waits on the rate limiter for upstream calls."""
+    def handler(request):
+        return weather_json(request)
+
+    async def run():
+        service = make_service(handler)
+        service.rate_limiter = RateLimiter(2, period=0.2)
+        start = time.monotonic()
+        await asyncio.gather(*[
+            service.get_weather(city) for city in ("London", "Paris", "Tokyo")
+        ])
+        await service.close()
+        return time.monotonic() - start, service.upstream_calls
+
+    elapsed, upstream_calls = asyncio.run(run())
+    assert upstream_calls == 3
+    assert elapsed >= 0.09
+    print("✅ Service upstream calls respect the quota")
+
+
+def test_half_open_probe_serves_stale():
+    """Test that a trial request after an outage does not block the user."""
+    state = {"up": True, "delay": 0.0, "temp": 20.0}
+
+    async def handler(request):
+        await asyncio.sleep(state["delay"])
+        if not state["up"]:
+            return httpx.Response(503)
+        return weather_json(request, state["temp"])
+
+    async def run():
+        service = make_service(handler)
+        service.cache_ttl = 0  # every call goes upstream
+        service.breaker.reset_timeout = 0.05
+        await service.get_weather("London")
+
+        state["up"] = False
+        for _ in range(service.breaker.failure_threshold):
+            await service.get_weather("London")
+        assert service.breaker.state == "open"
+
+        # Upstream recovers but is slow; the probe must not block
+        await asyncio.sleep(0.06)
+        state.update(up=True, delay=0.3, temp=25.0)
+        start = time.monotonic()
+        data = await service.get_weather("London")
+        assert time.monotonic() - start < 0.1
+        assert "_stale" in data and data["main"]["temp"] == 20.0
+
+        # The probe finishes in the background and refreshes the cache
+        await asyncio.sleep(0.4)
+        assert service.breaker.state == "closed"
+        entry = service._cache[service._cache_key(
+            service.base_url, service._city_params("London")
+        )]
+        assert entry[1]["main"]["temp"] == 25.0
+        await service.close()
+
+    asyncio.run(run())
+    print("✅ Half-open probe serves stale data immediately")
+
+
+def test_slow_upstream_serves_stale_after_deadline():
+    """Test that a slow upstream does not hold users with last-known data."""
+    state = {"delay": 0.0, "temp": 20.0}
+
+    async def handler(request):
+        await asyncio.sleep(state["delay"])
+        return weather_json(request, state["temp"])
+
+    async def run():
+        service = make_service(handler)
+        service.cache_ttl = 0
+        service.stale_deadline = 0.1
+        await service.get_weather("London")
+
+        # The breaker is still closed, but the user must not wait
+        state.update(delay=0.4, temp=25.0)
+        start = time.monotonic()
+        data = await service.get_weather("London")
+        assert time.monotonic() - start < 0.3
+        assert data["main"]["temp"] == 20.0 and "_stale" in data
+
+        # The fetch finishes in the background and refreshes the cache
+        await asyncio.sleep(0.4)
+        entry = service._cache[service._cache_key(
+            service.base_url, service._city_params("London")
+        )]
+        assert entry[1]["main"]["temp"] == 25.0
+        assert service.upstream_calls == 2
+
+        # Without last-known data the request is simply awaited
+        data = await service.get_weather("Paris")
+        assert "_stale" not in data
+        await service.close()
+
+    asyncio.run(run())
+    print("✅ Slow upstream serves stale data after a short deadline")
+
+
+def test_server_errors_open_breaker():
+    """Test that 5xx responses open the breaker and stale data is served."""
+    state = {"up": True, "calls": 0}
+
+    def handler(request):
+        state["calls"] += 1
+        if not state["up"]:
+            return httpx.Response(500)
+        return weather_json(request)
+
+    async def run():
+        service = make_service(handler)
+        service.cache_ttl = 0
+        await service.get_weather("London")
+
+        state["up"] = False
+        threshold = service.breaker.failure_threshold
+        for _ in range(threshold):
+            data = await service.get_weather("London")
+            assert data["_stale"]["age"] >= 0
+        assert service.breaker.state == "open"
+
+        # While open, nothing reaches the upstream
+        calls = state["calls"]
+        data = await service.get_weather("London")
+        assert data["main"]["temp"] == 20.0 and "_stale" in data
+        assert state["calls"] == calls
+
+        # Without last-known data the error is raised
+        try:
+            await service.get_weather("Paris")
+            assert False, "Should have raised an error"
+        except WeatherServiceError:
+            pass
+        await service.close()
+
+    asyncio.run(run())
+    print("✅ Server errors open the breaker and serve stale data")
+
+
+def test_full_cache_keeps_last_known_data():
+    """Test that a full cache evicts the oldest entries, not expired ones."""
+    state = {"up": True}
+
+    def handler(request):
+        if not state["up"]:
+            return httpx.Response(503)
+        return weather_json(request)
+
+    async def run():
+        service = make_service(handler)
+        service.cache_ttl = 0  # every entry is expired at once
+        service.cache_max_entries = 3
+        for city in ("London", "Paris", "Tokyo", "Cairo"):
+            await service.get_weather(city)
+
+        state["up"] = False
+        for city in ("Paris", "Tokyo", "Cairo"):
+            data = await service.get_weather(city)
+            assert data["name"] == city and "_stale" in data
+        try:
+            await service.get_weather("London")
+            assert False, "Should have raised an error"
+        except WeatherServiceError:
+            pass
+        await service.close()
+
+    asyncio.run(run())
+    print("✅ Full cache keeps the most recent last-known data")
+
+
+def test_dropped_connection_counts_as_failure():
+    """Test that transport errors count against the breaker."""
+    def handler(request):
+        raise httpx.RemoteProtocolError("Server disconnected", request=request)
+
+    async def run():
+        service = make_service(handler)
+        for _ in range(service.breaker.failure_threshold):
+            try:
+                await service.get_weather("London")
+            except WeatherServiceError:
+                pass
+        assert service.breaker.state == "open"
+        await service.close()
+
+    asyncio.run(run())
+    print("✅ Dropped connections count as failures")
+
+
+def make_hedging_service(handler, quota=10):
+    """Create a service that hedges any request slower than 50 ms."""
+    service = make_service(handler)
+    service.hedging = True
+    service.rate_limiter = RateLimiter(quota, period=3600)
+    service.hedge_policy.samples.extend([0.01] * service.hedge_policy.min_samples)
+    service.hedge_policy.tokens = 1.0
+    return service
+
+
+def test_slow_request_is_hedged():
+    """Test that one slow response triggers a single charged hedge."""
+    calls = []
+
+    async def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            await asyncio.sleep(0.5)
+        return weather_json(request, 20.0 + len(calls))
+
+    async def run():
+        service = make_hedging_service(handler)
+        start = time.monotonic()
+        data = await service.get_weather("London")
+        elapsed = time.monotonic() - start
+        await service.close()
+        return service, data, elapsed
+
+    service, data, elapsed = asyncio.run(run())
+    assert elapsed < 0.3
+    assert data["main"]["temp"] == 22.0  # the hedge's response won
+    assert len(calls) == 2
+    assert service.hedge_policy.hedges == 1
+    assert service.upstream_calls == 2
+    # Primary and hedge each took a quota token
+    assert service.rate_limiter.tokens < service.rate_limiter.capacity - 1.99
+    print("✅ Slow requests are hedged once and charged to the quota")
+
+
+def test_hedge_skipped_without_quota():
+    """Test that no hedge is sent when the quota has no token to spare."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.15)
+        return weather_json(request)
+
+    async def run():
+        service = make_hedging_service(handler, quota=1)
+        await service.get_weather("London")
+        await service.close()
+        return service
+
+    service = asyncio.run(run())
+    assert len(calls) == 1
+    assert service.hedge_policy.hedges == 0
+    assert service.upstream_calls == 1
+    print("✅ Hedges are skipped when the quota is used up")
+
+
+def test_hedged_failure_counts_once():
+    """Test that a hedged request failing twice is one breaker failure."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.1)
+        return httpx.Response(503)
+
+    async def run():
+        service = make_hedging_service(handler)
+        try:
+            await service.get_weather("London")
+            assert False, "Should have raised an error"
+        except WeatherServiceError:
+            pass
+        await service.close()
+        return service
+
+    service = asyncio.run(run())
+    assert len(calls) == 2
+    assert service.hedge_policy.hedges == 1
+    assert service.breaker.failures == 1
+    print("✅ Hedged failures count once against the breaker")
+
+
+def run_mock_tests():
+    """Run tests that use a mock upstream instead of the real API."""
+    print("Running Weather Service Mock Tests\n")
+    print("=" * 50)
+
+    test_concurrent_requests_are_merged()
+    test_cache_hit_within_ttl()
+    test_rate_limiter_blocks_beyond_capacity()
+    test_service_respects_quota()
+    test_half_open_probe_serves_stale()
+    test_slow_upstream_serves_stale_after_deadline()
+    test_server_errors_open_breaker()
+    test_full_cache_keeps_last_known_data()
+    test_dropped_connection_counts_as_failure()
+    test_slow_request_is_hedged()
+    test_hedge_skipped_without_quota()
+    test_hedged_failure_counts_once()
+
+    print("\n" + "=" * 50 + "\n")
+
+
 async def run_tests():
     """Run all tests."""
     print("Running Weather Service Tests\n")
@@ -59,4 +446,5 @@ async def run_tests():
 
 
 if __name__ == "__main__":
+    run_mock_tests()
     asyncio.run(run_tests())
\ No newline at end of file
@@ -0,0 +1,133 @@
+# test_weather_store.py
+"""Simple tests for the weather time-series store."""
+
+import tempfile
+from pathlib import Path
+from weather_store import Observation, WeatherStore, city_key
+
+
+def make_payload(dt, temp, name="London", country="GB"):
+    """Build a minimal OpenWeatherMap-style payload."""
+    return {
+        "dt": dt,
+        "name": name,
+        "sys": {"country": country},
+        "main": {"temp": temp, "humidity": 70, "pressure": 1012},
+        "wind": {"speed": 3.5},
+        "weather": [{"id": 800}],
+    }
+
+
+def test_append_and_query():
+    """Test appending snapshots and querying a time range."""
+    with tempfile.TemporaryDirectory() as root:
+        store = WeatherStore(root)
+        for i in range(10):
+            assert store.append(make_payload(1_700_000_000 + i * 600, 10 + i))
+
+        key = city_key("London", "GB")
+        records = store.query(key, 1_700_000_000 + 1200, 1_700_000_000 + 3000)
+        assert [r.temp for r in records] == [12, 13, 14, 15]
+        assert records[0].condition == 800
+        print("✅ Append and range query work")
+
+
+def test_duplicates_are_skipped():
+    """Test that repeated or older snapshots are not stored twice."""
+    with tempfile.TemporaryDirectory() as root:
+        store = WeatherStore(root)
+        assert store.append(make_payload(1_700_000_000, 10))
+        assert not store.append(make_payload(1_700_000_000, 11))
+
+        # A fresh store must pick up the latest timestamp from disk
+        reopened = WeatherStore(root)
+        assert not reopened.append(make_payload(1_699_999_000, 9))
+        assert len(reopened.query("london-gb")) == 1
+        print("✅ Duplicate snapshots are skipped")
+
+
+def test_interrupted_write():
+    """Test that a partial trailing record is dropped before appending."""
+    with tempfile.TemporaryDirectory() as root:
+        store = WeatherStore(root)
+        assert store.append(make_payload(1_700_000_000, 10))
+
+        # Simulate a crash part-way through writing the next record
+        segment = next((Path(root) / "london-gb").glob("*.seg"))
+        with open(segment, "ab") as f:
+            f.write(b"\x01\x02\x03")
+
+        reopened = WeatherStore(root)
+        assert reopened.append(make_payload(1_700_000_600, 11))
+        assert reopened.append(make_payload(1_700_001_200, 12))
+
+        records = WeatherStore(root).query("london-gb")
+        assert [r.timestamp for r in records] == [
+            1_700_000_000, 1_700_000_600, 1_700_001_200,
+        ]
+        assert [r.temp for r in records] == [10, 11, 12]
+        print("✅ Interrupted writes are repaired on append")
+
+
+def test_segments_span_months():
+    """Test queries across monthly segment files."""
+    with tempfile.TemporaryDirectory() as root:
+        store = WeatherStore(root)
+        # 2024-01-31 23:50 UTC and 2024-02-01 00:10 UTC
+        store.append_observation("x", Observation(1706745000, 1, 0, 0, 0, 0))
+        store.append_observation("x", Observation(1706746200, 2, 0, 0, 0, 0))
+
+        assert len(list((Path(root) / "x").glob("*.seg"))) == 2
+        assert [r.temp for r in store.query("x")] == [1, 2]
+        assert [r.temp for r in store.query("x", start=1706746000)] == [2]
+        print("✅ Queries span monthly segments")
+
+
+def test_aggregate():
+    """Test hourly downsampling of 10-minute samples."""
+    with tempfile.TemporaryDirectory() as root:
+        store = WeatherStore(root)
+        base = 1_700_000_000 - 1_700_000_000 % 3600
+        for i in range(12):
+            store.append_observation(
+                "x", Observation(base + i * 600, float(i), 50, 1000, 2, 800)
+            )
+
+        buckets = store.aggregate("x", 3600)
+        assert len(buckets) == 2
+        assert buckets[0].count == 6
+        assert (buckets[0].temp_min, buckets[0].temp_max) == (0, 5)
+        assert buckets[1].temp_mean == 8.5
+        print("✅ Aggregates downsample correctly")
+
+
+def test_export_csv():
+    """Test exporting a city's history to CSV."""
+    with tempfile.TemporaryDirectory() as root:
+        store = WeatherStore(root)
+        for i in range(3):
+            store.append(make_payload(1_700_000_000 + i * 600, 20))
+
+        path = Path(root) / "london.csv"
+        assert store.export_csv("london-gb", path) == 3
+        assert path.read_text().splitlines()[0].startswith("timestamp,temp")
+        print("✅ CSV export works")
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Weather Store Tests\n")
+    print("=" * 50)
+
+    test_append_and_query()
+    test_duplicates_are_skipped()
+    test_interrupted_write()
+    test_segments_span_months()
+    test_aggregate()
+    test_export_csv()
+
+    print("\n" + "=" * 50)
+
+
+if __name__ == "__main__":
+    run_tests()
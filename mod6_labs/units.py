@@ -0,0 +1,66 @@
+# units.py
+"""Unit conversion for displaying weather data."""
+
+from typing import Iterable, List
+
+# Data is always fetched and cached in metric; these are display systems
+UNIT_SYSTEMS = ("metric", "imperial", "standard")
+
+LABELS = {
+    "metric": {"temperature": "°C", "speed": "m/s", "pressure": "hPa"},
+    "imperial": {"temperature": "°F", "speed": "mph", "pressure": "inHg"},
+    "standard": {"temperature": "K", "speed": "m/s", "pressure": "hPa"},
+}
+
+# (scale, offset) applied to the metric value: converted = value * scale + offset
+_FACTORS = {
+    "temperature": {
+        "metric": (1.0, 0.0),
+        "imperial": (1.8, 32.0),
+        "standard": (1.0, 273.15),
+    },
+    "speed": {
+        "metric": (1.0, 0.0),
+        "imperial": (2.236936, 0.0),
+        "standard": (1.0, 0.0),
+    },
+    "pressure": {
+        "metric": (1.0, 0.0),
+        "imperial": (0.02953, 0.0),
+        "standard": (1.0, 0.0),
+    },
+}
+
+
+def convert(quantity: str, values: Iterable[float], system: str) -> List[float]:
+    """
+    Convert a batch of metric values to another unit system.
+
+    Args:
+        quantity: "temperature", "speed" or "pressure"
+        values: Values in metric units
+        system: Target unit system (see UNIT_SYSTEMS)
+
+    Returns:
+        Converted values in the same order
+    """
+    scale, offset = _FACTORS[quantity][system]
+    if scale == 1.0 and offset == 0.0:
+        return list(values)
+    return [value * scale + offset for value in values]
+
+
+def convert_one(quantity: str, value: float, system: str) -> float:
+    """Convert a single metric value to another unit system."""
+    scale, offset = _FACTORS[quantity][system]
+    return value * scale + offset
+
+
+def label(quantity: str, system: str) -> str:
+    """Return the unit label for a quantity, e.g. '°F'."""
+    return LABELS[system][quantity]
+
+
+def next_system(system: str) -> str:
+    """Return the unit system that follows system in the toggle order."""
+    return UNIT_SYSTEMS[(UNIT_SYSTEMS.index(system) + 1) % len(UNIT_SYSTEMS)]
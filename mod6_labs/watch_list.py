@@ -0,0 +1,172 @@
+# watch_list.py
+"""In-memory models for the multi-city dashboard."""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+# Temperature bands in canonical metric units: (min inclusive, max exclusive)
+TEMP_BANDS = {
+    "hot": (30.0, None),
+    "mild": (10.0, 30.0),
+    "cold": (None, 10.0),
+}
+
+SORT_KEYS = ("name", "temp", "condition")
+
+
+class CityEntry:
+    """Latest known weather for one watched city (metric units)."""
+
+    __slots__ = (
+        "name", "temp", "condition", "description", "icon", "updated_at", "error",
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.temp: Optional[float] = None
+        self.condition = ""
+        self.description = ""
+        self.icon = ""
+        self.updated_at: Optional[float] = None
+        self.error = ""
+
+    @property
+    def key(self) -> str:
+        return self.name.strip().lower()
+
+
+class WatchList:
+    """
+    A list of watched cities with sorting and filtering.
+
+    Sorting and filtering only reorder references to the entries, so the
+    dashboard can re-bind its fixed set of row controls instead of
+    rebuilding them.
+    """
+
+    def __init__(self, cities: Iterable[str] = ()):
+        self.entries: List[CityEntry] = []
+        self._by_key: Dict[str, CityEntry] = {}
+        self.sort_key = "name"
+        self.reverse = False
+        self.text = ""
+        self.band: Optional[str] = None
+        self.visible: List[CityEntry] = []
+
+        for city in cities:
+            self.add(city, apply=False)
+        self.apply()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, city: str) -> Optional[CityEntry]:
+        return self._by_key.get(city.strip().lower())
+
+    def add(self, city: str, apply: bool = True) -> Optional[CityEntry]:
+        """Add a city, ignoring blanks and duplicates."""
+        city = city.strip()
+        if not city or self.get(city):
+            return None
+        entry = CityEntry(city)
+        self.entries.append(entry)
+        self._by_key[entry.key] = entry
+        if apply:
+            self.apply()
+        return entry
+
+    def remove(self, city: str):
+        """Remove a city from the watch list."""
+        entry = self._by_key.pop(city.strip().lower(), None)
+        if entry:
+            self.entries.remove(entry)
+            self.apply()
+
+    def update(self, city: str, data: Dict) -> Optional[CityEntry]:
+        """Store a weather payload on the matching entry."""
+        entry = self.get(city)
+        if entry is None:
+            return None
+        weather = data.get("weather", [{}])[0]
+        entry.temp = data.get("main", {}).get("temp")
+        entry.condition = weather.get("main", "")
+        entry.description = weather.get("description", "").title()
+        entry.icon = weather.get("icon", "")
+        entry.updated_at = time.time()
+        entry.error = ""
+        return entry
+
+    def set_error(self, city: str, message: str) -> Optional[CityEntry]:
+        """Record a fetch error on the matching entry."""
+        entry = self.get(city)
+        if entry:
+            entry.error = message
+        return entry
+
+    def set_sort(self, key: str, reverse: bool = False):
+        """Sort by "name", "temp" or "condition"."""
+        if key not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{key}'")
+        self.sort_key = key
+        self.reverse = reverse
+        self.apply()
+
+    def set_filter(self, text: str = "", band: Optional[str] = None):
+        """Filter by name/condition text and an optional temperature band."""
+        if band is not None and band not in TEMP_BANDS:
+            raise ValueError(f"Unknown temperature band '{band}'")
+        self.text = text.strip().lower()
+        self.band = band
+        self.apply()
+
+    def _matches(self, entry: CityEntry) -> bool:
+        if self.text and not (
+            self.text in entry.key
+            or self.text in entry.description.lower()
+            or self.text in entry.condition.lower()
+        ):
+            return False
+        if self.band:
+            if entry.temp is None:
+                return False
+            low, high = TEMP_BANDS[self.band]
+            if low is not None and entry.temp < low:
+                return False
+            if high is not None and entry.temp >= high:
+                return False
+        return True
+
+    def apply(self):
+        """Recompute the visible entries from the current sort and filter."""
+        visible = [entry for entry in self.entries if self._matches(entry)]
+
+        if self.sort_key == "temp":
+            # Cities without data always go last
+            known = [e for e in visible if e.temp is not None]
+            unknown = [e for e in visible if e.temp is None]
+            known.sort(key=lambda e: e.temp, reverse=self.reverse)
+            visible = known + unknown
+        elif self.sort_key == "condition":
+            visible.sort(key=lambda e: (e.condition, e.key), reverse=self.reverse)
+        else:
+            visible.sort(key=lambda e: e.key, reverse=self.reverse)
+
+        self.visible = visible
+
+    def window(self, offset: int, size: int) -> List[CityEntry]:
+        """Return the visible entries in [offset, offset + size)."""
+        return self.visible[offset:offset + size]
+
+    @classmethod
+    def load(cls, store) -> "WatchList":
+        """
+        Load a watch list saved as a JSON list of city names.
+
+        Args:
+            store: A storage.FileStore or storage.ClientStorageStore
+        """
+        return cls(store.load([]))
+
+    def save(self, store):
+        """Save the city names as a JSON list."""
+        store.save([entry.name for entry in self.entries])
@@ -1,9 +1,14 @@
 # weather_service.py
 """Weather API service layer."""
 
+import asyncio
+import time
 import httpx
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from circuit_breaker import CircuitBreaker
 from config import Config
+from hedging import HedgePolicy, hedged
 
 
 class WeatherServiceError(Exception):
@@ -11,121 +16,342 @@ class WeatherServiceError(Exception):
     pass
 
 
+class ServiceUnavailableError(WeatherServiceError):
+    """Raised when the upstream API is down, slow or unreachable."""
+    pass
+
+
+class RateLimiter:
+    """Token bucket limiting how many upstream calls are made per period."""
+
+    def __init__(self, calls: int, period: float):
+        self.capacity = calls
+        self.period = period
+        self.tokens = float(calls)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.capacity / self.period,
+        )
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a call is allowed, then consume one token."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep(
+                    (1 - self.tokens) * self.period / self.capacity
+                )
+                self._refill()
+            self.tokens -= 1
+
+    def try_acquire(self) -> bool:
+        """Consume a token only if one is available right now."""
+        self._refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
 class WeatherService:
-    """Service for fetching weather data from OpenWeatherMap API."""
-    
-    def __init__(self):
+    """
+    Service for fetching weather data from OpenWeatherMap API.
+
+    One instance can be shared by many UI sessions: it keeps a single
+    connection pool, caches responses for Config.CACHE_TTL seconds,
+    merges identical requests that are already in flight and enforces
+    the upstream quota.
+
+    With Config.HEDGING_ENABLED, a request still running after the
+    observed p95 latency is duplicated and the first response wins.
+
+    Upstream calls go through a circuit breaker. While the API is
+    failing, requests fail fast and the last known response is served
+    instead, marked with a "_stale" entry holding its age in seconds.
+    Trial requests after an outage also serve that response right away
+    and finish in the background, and any request with a last known
+    response serves it after Config.STALE_DEADLINE seconds rather than
+    waiting out the full timeout.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.api_key = Config.API_KEY
         self.base_url = Config.BASE_URL
+        self.forecast_url = Config.FORECAST_URL
         self.timeout = Config.TIMEOUT
-    
-    async def get_weather(self, city: str) -> Dict:
+        self.stale_deadline = Config.STALE_DEADLINE
+        self.cache_ttl = Config.CACHE_TTL
+        self.cache_max_entries = Config.CACHE_MAX_ENTRIES
+        self.rate_limiter = RateLimiter(Config.RATE_LIMIT_PER_MINUTE, 60)
+        self.breaker = CircuitBreaker(
+            failure_threshold=Config.BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=Config.BREAKER_RESET_TIMEOUT,
+            half_open_max_calls=Config.BREAKER_HALF_OPEN_CALLS,
+        )
+        self.hedge_policy = HedgePolicy(
+            percentile=Config.HEDGE_PERCENTILE,
+            budget_ratio=Config.HEDGE_BUDGET_RATIO,
+            min_delay=Config.HEDGE_MIN_DELAY,
+        )
+        self.hedging = Config.HEDGING_ENABLED
+        self.upstream_calls = 0
+
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        # Oldest first; expired entries stay as last-known data until evicted
+        self._cache: "OrderedDict[Tuple, Tuple[float, Dict]]" = OrderedDict()
+        self._in_flight: Dict[Tuple, asyncio.Task] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=self._transport,
+                limits=httpx.Limits(max_connections=Config.MAX_CONNECTIONS),
+            )
+        return self._client
+
+    async def close(self):
+        """Close the shared connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _cache_key(url: str, params: Dict) -> Tuple:
+        normalized = {
+            k: v.strip().lower() if isinstance(v, str) else v
+            for k, v in params.items()
+        }
+        return (url, tuple(sorted(normalized.items())))
+
+    @staticmethod
+    def _city_params(city: str) -> Dict:
+        return {
+            "q": city,
+            "units": Config.UNITS,
+        }
+
+    def is_cached(self, city: str, forecast: bool = False) -> bool:
+        """Return True if weather (or forecast) for city is cached and fresh."""
+        url = self.forecast_url if forecast else self.base_url
+        return self.get_cached(url, self._city_params(city)) is not None
+
+    def is_pending(self, city: str, forecast: bool = False) -> bool:
+        """Return True if weather (or forecast) for city is being fetched."""
+        url = self.forecast_url if forecast else self.base_url
+        return self._cache_key(url, self._city_params(city)) in self._in_flight
+
+    def get_cached(self, url: str, params: Dict) -> Optional[Dict]:
+        """Return a fresh cached response, or None."""
+        entry = self._cache.get(self._cache_key(url, params))
+        if entry and time.monotonic() - entry[0] < self.cache_ttl:
+            return entry[1]
+        return None
+
+    async def _get_json(self, url: str, params: Dict, label: str) -> Dict:
         """
-        Fetch weather data for a given city.
-        
+        GET a JSON document, going through the cache and in-flight table.
+
         Args:
-            city: Name of the city
-            
-        Returns:
-            Dictionary containing weather data
-            
+            url: Endpoint URL
+            params: Query parameters (without the API key)
+            label: What is being fetched, used in the 404 message
+
         Raises:
             WeatherServiceError: If the request fails
         """
-        if not city:
-            raise WeatherServiceError("City name cannot be empty")
-        
-        # Build request parameters
-        params = {
-            "q": city,
-            "appid": self.api_key,
-            "units": Config.UNITS,
-        }
-        
+        cached = self.get_cached(url, params)
+        if cached is not None:
+            return cached
+
+        key = self._cache_key(url, params)
+        unavailable = ServiceUnavailableError(
+            "Weather service is temporarily unavailable. "
+            "Please try again later."
+        )
+        task = self._in_flight.get(key)
+        if task is None:
+            probing = self.breaker.state == CircuitBreaker.HALF_OPEN
+            if not self.breaker.allow_request():
+                return self._stale_or_raise(key, unavailable)
+            task = asyncio.ensure_future(self._fetch(url, params, label))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._on_fetch_done(key, t))
+
+            if probing and key in self._cache:
+                # Let the trial request run in the background rather than
+                # making this user wait on a possibly dead upstream
+                return self._stale_or_raise(key, unavailable)
+
+        try:
+            # Shield so one session giving up does not cancel the others
+            if key not in self._cache:
+                return await asyncio.shield(task)
+            # With last known data to fall back on, only wait briefly;
+            # the fetch keeps running and refreshes the cache when done
+            return await asyncio.wait_for(
+                asyncio.shield(task), self.stale_deadline
+            )
+        except asyncio.TimeoutError:
+            return self._stale_or_raise(key, unavailable)
+        except ServiceUnavailableError as e:
+            return self._stale_or_raise(key, e)
+
+    def _on_fetch_done(self, key: Tuple, task: asyncio.Task):
+        """Clear a finished request from the in-flight table and cache it."""
+        self._in_flight.pop(key, None)
+        # Runs before any waiter resumes, so the cache is filled even
+        # when nobody awaits the task (background trial requests)
+        if not task.cancelled() and task.exception() is None:
+            self._store(key, task.result())
+
+    def _stale_or_raise(self, key: Tuple, error: WeatherServiceError) -> Dict:
+        """Return the last known response for key, or raise error."""
+        entry = self._cache.get(key)
+        if entry is None:
+            raise error
+        stored_at, data = entry
+        return {**data, "_stale": {"age": time.monotonic() - stored_at}}
+
+    def _store(self, key: Tuple, data: Dict):
+        """Cache a response, evicting the least recently stored when full."""
+        self._cache[key] = (time.monotonic(), data)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    async def _fetch(self, url: str, params: Dict, label: str) -> Dict:
+        """Perform a single upstream request."""
+        await self.rate_limiter.acquire()
+        self.upstream_calls += 1
+
+        try:
+            if self.hedging:
+                data = await hedged(
+                    lambda: self._request(url, params, label),
+                    self.hedge_policy,
+                    allow_extra=self._allow_hedge,
+                )
+            else:
+                data = await self._request(url, params, label)
+        except ServiceUnavailableError:
+            self.breaker.record_failure()
+            raise
+        except WeatherServiceError:
+            # Client errors (bad city, bad key) still mean the API is up
+            self.breaker.record_success()
+            raise
+
+        self.breaker.record_success()
+        return data
+
+    def _allow_hedge(self) -> bool:
+        """Charge a hedged request to the quota without waiting."""
+        if not self.rate_limiter.try_acquire():
+            return False
+        self.upstream_calls += 1
+        return True
+
+    async def _request(self, url: str, params: Dict, label: str) -> Dict:
+        """Send the HTTP request and map failures to service errors."""
         try:
-            # Make async HTTP request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                # Check for HTTP errors
-                if response.status_code == 404:
-                    raise WeatherServiceError(
-                        f"City '{city}' not found. Please check the spelling."
-                    )
-                elif response.status_code == 401:
-                    raise WeatherServiceError(
-                        "Invalid API key. Please check your configuration."
-                    )
-                elif response.status_code >= 500:
-                    raise WeatherServiceError(
-                        "Weather service is currently unavailable. "
-                        "Please try again later."
-                    )
-                elif response.status_code != 200:
-                    raise WeatherServiceError(
-                        f"Error fetching weather data: {response.status_code}"
-                    )
-                
-                # Parse JSON response
-                data = response.json()
-                return data
-                
+            response = await self._get_client().get(
+                url, params={**params, "appid": self.api_key}
+            )
+
+            # Check for HTTP errors
+            if response.status_code == 404:
+                raise WeatherServiceError(
+                    f"{label} not found. Please check the spelling."
+                )
+            elif response.status_code == 401:
+                raise WeatherServiceError(
+                    "Invalid API key. Please check your configuration."
+                )
+            elif response.status_code >= 500:
+                raise ServiceUnavailableError(
+                    "Weather service is currently unavailable. "
+                    "Please try again later."
+                )
+            elif response.status_code != 200:
+                raise WeatherServiceError(
+                    f"Error fetching weather data: {response.status_code}"
+                )
+
+            # Parse JSON response
+            return response.json()
+
+        except WeatherServiceError:
+            raise
         except httpx.TimeoutException:
-            raise WeatherServiceError(
+            raise ServiceUnavailableError(
                 "Request timed out. Please check your internet connection."
             )
-        except httpx.NetworkError:
-            raise WeatherServiceError(
+        except httpx.TransportError:
+            # Network errors, dropped connections and protocol errors all
+            # mean the upstream is unhealthy
+            raise ServiceUnavailableError(
                 "Network error. Please check your internet connection."
             )
         except httpx.HTTPError as e:
             raise WeatherServiceError(f"HTTP error occurred: {str(e)}")
         except Exception as e:
             raise WeatherServiceError(f"An unexpected error occurred: {str(e)}")
-    
+
+    async def get_weather(self, city: str) -> Dict:
+        """
+        Fetch weather data for a given city.
+
+        Args:
+            city: Name of the city
+
+        Returns:
+            Dictionary containing weather data
+
+        Raises:
+            WeatherServiceError: If the request fails
+        """
+        if not city:
+            raise WeatherServiceError("City name cannot be empty")
+
+        # Build request parameters
+        params = self._city_params(city)
+        return await self._get_json(self.base_url, params, f"City '{city}'")
+
     async def get_forecast(self, city: str) -> Dict:
         """Get 5-day weather forecast."""
-        forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
-        params = {
-            "q": city,
-            "appid": self.api_key,
-            "units": Config.UNITS,
-        }
-        
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(forecast_url, params=params)
-            response.raise_for_status()
-            return response.json()
-        
+        if not city:
+            raise WeatherServiceError("City name cannot be empty")
+
+        params = self._city_params(city)
+        return await self._get_json(self.forecast_url, params, f"City '{city}'")
+
     async def get_weather_by_coordinates(
-        self, 
-        lat: float, 
+        self,
+        lat: float,
         lon: float
     ) -> Dict:
         """
         Fetch weather data by coordinates.
-        
+
         Args:
             lat: Latitude
             lon: Longitude
-            
+
         Returns:
             Dictionary containing weather data
         """
         params = {
-            "lat": lat,
-            "lon": lon,
-            "appid": self.api_key,
+            "lat": round(lat, 2),
+            "lon": round(lon, 2),
             "units": Config.UNITS,
         }
-        
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                return response.json()
-                
-        except Exception as e:
-            raise WeatherServiceError(f"Error fetching weather data: {str(e)}")
-        
-        
+        return await self._get_json(self.base_url, params, "Location")
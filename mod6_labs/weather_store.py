@@ -0,0 +1,294 @@
+# weather_store.py
+"""Append-only time-series store for observed weather."""
+
+import csv
+import mmap
+import re
+import struct
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+
+# timestamp, temp, humidity, pressure, wind speed, condition code
+RECORD = struct.Struct("<qffffi")
+TIMESTAMP = struct.Struct("<q")
+
+
+class Observation(NamedTuple):
+    """A single recorded weather snapshot."""
+
+    timestamp: int
+    temp: float
+    humidity: float
+    pressure: float
+    wind_speed: float
+    condition: int
+
+
+class Aggregate(NamedTuple):
+    """Downsampled statistics for one time bucket."""
+
+    bucket_start: int
+    count: int
+    temp_min: float
+    temp_max: float
+    temp_mean: float
+    humidity_mean: float
+    pressure_mean: float
+    wind_speed_mean: float
+
+
+class _Timestamps:
+    """Sequence view over the timestamps of a mapped segment (for bisect)."""
+
+    def __init__(self, buffer, count: int):
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> int:
+        return TIMESTAMP.unpack_from(self.buffer, index * RECORD.size)[0]
+
+
+def city_key(name: str, country: str = "") -> str:
+    """Build a filesystem-safe key for a city, e.g. 'london-gb'."""
+    label = f"{name}-{country}" if country else name
+    key = re.sub(r"[^a-z0-9]+", "-", label.strip().lower()).strip("-")
+    if not key:
+        raise ValueError("City name cannot be empty")
+    return key
+
+
+def _segment_name(timestamp: int) -> str:
+    """Return the monthly segment file name for a timestamp."""
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return f"{moment:%Y-%m}.seg"
+
+
+def _segment_bounds(path: Path):
+    """Return the [start, end) timestamps covered by a segment file."""
+    year, month = (int(part) for part in path.stem.split("-"))
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    if month == 12:
+        end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    else:
+        end = datetime(year, month + 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+class WeatherStore:
+    """
+    Stores weather snapshots as fixed-width binary records.
+
+    Each city gets its own directory with one segment file per month.
+    Records are only ever appended in timestamp order, so reads can
+    memory-map a segment and binary search it without loading it.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._last_timestamp: Dict[str, int] = {}
+
+    def _city_dir(self, key: str) -> Path:
+        return self.root / key
+
+    def _segments(self, key: str) -> List[Path]:
+        city_dir = self._city_dir(key)
+        if not city_dir.exists():
+            return []
+        return sorted(city_dir.glob("*.seg"))
+
+    def _latest_timestamp(self, key: str) -> Optional[int]:
+        """Return the newest stored timestamp for a city, if any."""
+        if key in self._last_timestamp:
+            return self._last_timestamp[key]
+
+        latest = None
+        for segment in reversed(self._segments(key)):
+            count = segment.stat().st_size // RECORD.size
+            if count:
+                with open(segment, "rb") as f:
+                    f.seek((count - 1) * RECORD.size)
+                    latest = RECORD.unpack(f.read(RECORD.size))[0]
+                break
+
+        if latest is not None:
+            self._last_timestamp[key] = latest
+        return latest
+
+    def cities(self) -> List[str]:
+        """List the keys of all cities with recorded data."""
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
+
+    def append(self, data: Dict) -> bool:
+        """
+        Record a weather payload as returned by WeatherService.get_weather.
+
+        Args:
+            data: Current weather payload from OpenWeatherMap
+
+        Returns:
+            True if a record was written, False if the snapshot was a
+            duplicate or older than the latest stored one
+        """
+        key = city_key(data.get("name", ""), data.get("sys", {}).get("country", ""))
+        main = data.get("main", {})
+        observation = Observation(
+            timestamp=int(data.get("dt", 0)),
+            temp=main.get("temp", 0),
+            humidity=main.get("humidity", 0),
+            pressure=main.get("pressure", 0),
+            wind_speed=data.get("wind", {}).get("speed", 0),
+            condition=data.get("weather", [{}])[0].get("id", 0),
+        )
+        return self.append_observation(key, observation)
+
+    def append_observation(self, key: str, observation: Observation) -> bool:
+        """Append a single observation for a city key."""
+        latest = self._latest_timestamp(key)
+        if latest is not None and observation.timestamp <= latest:
+            return False
+
+        city_dir = self._city_dir(key)
+        city_dir.mkdir(parents=True, exist_ok=True)
+        segment = city_dir / _segment_name(observation.timestamp)
+        with open(segment, "ab") as f:
+            # Drop a partial record left by an interrupted write so the
+            # new record stays aligned
+            size = f.seek(0, 2)
+            if size % RECORD.size:
+                f.truncate(size - size % RECORD.size)
+            f.write(RECORD.pack(*observation))
+
+        self._last_timestamp[key] = observation.timestamp
+        return True
+
+    def iter_range(
+        self,
+        key: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Iterator[Observation]:
+        """
+        Iterate over observations with start <= timestamp <= end.
+
+        Only segments overlapping the range are opened, and each one is
+        memory-mapped so nothing beyond the matching records is read.
+        """
+        for segment in self._segments(key):
+            seg_start, seg_end = _segment_bounds(segment)
+            if start is not None and seg_end <= start:
+                continue
+            if end is not None and seg_start > end:
+                break
+
+            # Ignore a trailing partial record left by an interrupted write
+            count = segment.stat().st_size // RECORD.size
+            if not count:
+                continue
+
+            with open(segment, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    timestamps = _Timestamps(mm, count)
+                    first = 0 if start is None else bisect_left(timestamps, start)
+                    last = count if end is None else bisect_right(timestamps, end)
+                    for index in range(first, last):
+                        yield Observation(*RECORD.unpack_from(mm, index * RECORD.size))
+
+    def query(
+        self,
+        key: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Observation]:
+        """Return observations for a city within a time range."""
+        return list(self.iter_range(key, start, end))
+
+    def aggregate(
+        self,
+        key: str,
+        bucket_seconds: int,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Aggregate]:
+        """
+        Downsample a time range into fixed-size buckets.
+
+        Args:
+            key: City key (see city_key)
+            bucket_seconds: Width of each bucket, e.g. 3600 for hourly
+            start: Optional lower timestamp bound (inclusive)
+            end: Optional upper timestamp bound (inclusive)
+
+        Returns:
+            One Aggregate per non-empty bucket, oldest first
+        """
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+
+        results = []
+        bucket = None
+        count = 0
+        temp_min = temp_max = temp_sum = humidity_sum = pressure_sum = wind_sum = 0.0
+
+        def flush():
+            results.append(Aggregate(
+                bucket_start=bucket,
+                count=count,
+                temp_min=temp_min,
+                temp_max=temp_max,
+                temp_mean=temp_sum / count,
+                humidity_mean=humidity_sum / count,
+                pressure_mean=pressure_sum / count,
+                wind_speed_mean=wind_sum / count,
+            ))
+
+        for obs in self.iter_range(key, start, end):
+            obs_bucket = obs.timestamp - obs.timestamp % bucket_seconds
+            if obs_bucket != bucket:
+                if count:
+                    flush()
+                bucket = obs_bucket
+                count = 0
+                temp_min = temp_max = obs.temp
+                temp_sum = humidity_sum = pressure_sum = wind_sum = 0.0
+
+            count += 1
+            temp_min = min(temp_min, obs.temp)
+            temp_max = max(temp_max, obs.temp)
+            temp_sum += obs.temp
+            humidity_sum += obs.humidity
+            pressure_sum += obs.pressure
+            wind_sum += obs.wind_speed
+
+        if count:
+            flush()
+        return results
+
+    def export_csv(
+        self,
+        key: str,
+        path,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> int:
+        """
+        Export a city's observations to a CSV file.
+
+        Returns:
+            Number of rows written
+        """
+        rows = 0
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(Observation._fields)
+            for obs in self.iter_range(key, start, end):
+                writer.writerow(obs)
+                rows += 1
+        return rows